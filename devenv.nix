@@ -21,6 +21,7 @@
     requests
     pytest
     pytest-cov
+    pytest-xdist
     black
     flake8
     autopep8
@@ -3,6 +3,7 @@
 Test runner for SQLAlchemy-based tests.
 """
 
+import importlib.util
 import pytest
 import sys
 import os
@@ -11,6 +12,9 @@ import os
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
+# Spread test files across CPU cores when pytest-xdist is installed
+PARALLEL_ARGS = ['-n', 'auto', '--dist=loadfile'] if importlib.util.find_spec('xdist') else []
+
 
 def run_sqlalchemy_tests():
     """Run SQLAlchemy-specific tests."""
@@ -36,6 +40,7 @@ def run_sqlalchemy_tests():
         '--tb=short',  # Short traceback format
         '--strict-markers',  # Strict marker checking
         '--color=yes',  # Colored output
+        *PARALLEL_ARGS,
         *test_files
     ]
     
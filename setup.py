@@ -14,12 +14,14 @@ setup(
         "Flask>=2.3.3",
         "Flask-CORS>=4.0.0",
         "requests>=2.31.0",
+        "orjson>=3.8.3",
         "python-dotenv>=1.0.0",
     ],
     extras_require={
         "dev": [
             "pytest>=7.4.3",
             "pytest-cov>=4.1.0",
+            "pytest-xdist>=3.5.0",
             "black>=23.9.1",
             "flake8>=6.1.0",
         ]
@@ -5,10 +5,15 @@ A clean, organized web application for tracking item prices with book search
 functionality.
 """
 
+import logging
+
+import orjson
 from dotenv import load_dotenv
 from flask import Flask
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 
+from src.config import Config
 from src.database.sqlalchemy_connection import init_app, migrate_existing_data
 from src.routes.books import books_bp
 from src.routes.categories import categories_bp
@@ -20,10 +25,23 @@ from src.routes.movies import movies_bp
 load_dotenv()
 
 
+class OrjsonProvider(JSONProvider):
+    """Serialize API responses with orjson, which is much faster than stdlib json for large payloads."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 def create_app():
     """Create and configure the Flask application."""
     import os
 
+    # Configure logging from LOG_LEVEL / LOG_FORMAT
+    logging.basicConfig(level=Config.LOG_LEVEL, format=Config.LOG_FORMAT)
+
     # Get the directory where this app.py file is located
     app_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -32,6 +50,7 @@ def create_app():
         template_folder=os.path.join(app_dir, "templates"),
         static_folder=os.path.join(app_dir, "static"),
     )
+    app.json = OrjsonProvider(app)
     CORS(app)
 
     # Initialize SQLAlchemy
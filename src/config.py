@@ -23,9 +23,19 @@ class Config:
     HOST = os.getenv("HOST", "0.0.0.0")
     PORT = int(os.getenv("PORT", 8000))
 
+    # Logging configuration
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
     # Book search configuration
     GOOGLE_BOOKS_API_TIMEOUT = int(os.getenv("GOOGLE_BOOKS_API_TIMEOUT", 10))
 
+    # Seconds to reuse successful book/movie search responses
+    SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", 300))
+
+    # CSV uploads (preview/import) allowed to run at once in each worker process
+    CSV_IMPORT_CONCURRENCY = int(os.getenv("CSV_IMPORT_CONCURRENCY", 2))
+
 
 class DevelopmentConfig(Config):
     """Development configuration."""
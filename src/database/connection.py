@@ -4,12 +4,23 @@ Database connection and initialization module.
 
 import os
 import sqlite3
+import time
+from typing import Dict, Optional, Tuple
 
 from src.config import Config
 
 # Configuration
 DATABASE_PATH = Config.DATABASE_PATH
 
+# Category rows are read on every movie import request but rarely change, so
+# keep them in-process for a short time. Maps category id -> (cached_at, row).
+CATEGORY_CACHE_TTL = 60
+_category_cache: Dict[int, Tuple[float, tuple]] = {}
+
+# Stored in the database's user_version once init_database has run; bump it when the
+# schema below changes so existing databases are brought up to date on next start
+SCHEMA_VERSION = 1
+
 
 def get_db_connection():
     """Get SQLite database connection."""
@@ -18,12 +29,46 @@ def get_db_connection():
     return conn
 
 
+def get_category(cursor, category_id: int) -> Optional[tuple]:
+    """Get an (id, type, name) category row, using the in-process cache."""
+    cached = _category_cache.get(category_id)
+    if cached and time.monotonic() - cached[0] < CATEGORY_CACHE_TTL:
+        return cached[1]
+
+    cursor.execute("SELECT id, type, name FROM categories WHERE id = ?", (category_id,))
+    row = cursor.fetchone()
+    if row is None:
+        _category_cache.pop(category_id, None)
+        return None
+
+    category_row = tuple(row)
+    _category_cache[category_id] = (time.monotonic(), category_row)
+    return category_row
+
+
+def invalidate_category_cache(category_id: Optional[int] = None):
+    """Drop one cached category row, or all of them when no id is given."""
+    if category_id is None:
+        _category_cache.clear()
+    else:
+        _category_cache.pop(category_id, None)
+
+
 def init_database():
-    """Initialize database with proper schema."""
+    """Initialize database with proper schema. Does nothing if the schema is already current."""
     db_dir = os.path.dirname(DATABASE_PATH)
     if db_dir:
         os.makedirs(db_dir, exist_ok=True)
     conn = get_db_connection()
+
+    # Take the write lock up front so workers starting together set the schema up one
+    # at a time; the rest then see the stored schema version and skip straight past
+    conn.execute("BEGIN IMMEDIATE")
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        conn.rollback()
+        conn.close()
+        return
+
     cursor = conn.cursor()
 
     # Create categories table
@@ -116,6 +161,7 @@ def init_database():
         print("🕐 Adding 'last_updated' column to items table...")
         cursor.execute("ALTER TABLE items ADD COLUMN last_updated TIMESTAMP")
 
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.commit()
     conn.close()
     print("✅ Database initialized")
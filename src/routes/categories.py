@@ -4,6 +4,7 @@ Category management routes using SQLAlchemy.
 
 from flask import Blueprint, jsonify, request
 
+from src.database.connection import invalidate_category_cache
 from src.models.database import Category, db
 
 categories_bp = Blueprint("categories", __name__)
@@ -80,6 +81,7 @@ def update_category(category_id):
         category.book_lookup_source = data.get("bookLookupSource", "auto")
 
         db.session.commit()
+        invalidate_category_cache(category_id)
 
         return jsonify(category.to_dict())
 
@@ -99,6 +101,7 @@ def delete_category(category_id):
     try:
         db.session.delete(category)
         db.session.commit()
+        invalidate_category_cache(category_id)
 
         return jsonify({"success": True})
 
@@ -2,18 +2,91 @@
 Movie search routes and functionality.
 """
 
+import codecs
 import csv
+import functools
 import io
+import itertools
+import logging
+import threading
+from urllib.parse import quote
 
-import requests
-from flask import Blueprint, jsonify, request
+import orjson
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 
-from src.database.connection import get_db_connection
+from src.config import Config
+from src.database.connection import get_category, get_db_connection
 from src.models.database import Item, PendingMovieSearch, db
-from src.services.movie_search import search_apple_movies
+from src.services.movie_search import iter_apple_movie_searches, search_apple_movies
+
+logger = logging.getLogger(__name__)
 
 movies_bp = Blueprint("movies", __name__, url_prefix="/api/movies")
 
+# Number of imported movies written to the database per executemany() call
+CSV_INSERT_BATCH_SIZE = 100
+
+# CSV uploads fan out into many Apple Store lookups, so cap how many run at once
+# to leave worker threads and pooled connections for other endpoints
+csv_import_semaphore = threading.BoundedSemaphore(Config.CSV_IMPORT_CONCURRENCY)
+CSV_IMPORT_RETRY_AFTER = 10
+
+# Bytes decoded at a time when checking an upload's encoding before it is imported
+CSV_ENCODING_CHECK_CHUNK_SIZE = 64 * 1024
+
+
+def limit_concurrent_imports(view):
+    """Reject a CSV upload with 429 while the maximum number of uploads are already running."""
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not csv_import_semaphore.acquire(blocking=False):
+            response = jsonify({"error": "Too many CSV imports in progress, please try again shortly"})
+            response.headers["Retry-After"] = str(CSV_IMPORT_RETRY_AFTER)
+            return response, 429
+
+        try:
+            response = view(*args, **kwargs)
+        except BaseException:
+            csv_import_semaphore.release()
+            raise
+
+        # A streamed response is still importing after the view returns, so hold the slot until the
+        # server closes the response, which it does even if the body was never read
+        if isinstance(response, Response) and response.is_streamed:
+            response.call_on_close(_release_import_slot_once())
+        else:
+            csv_import_semaphore.release()
+
+        return response
+
+    return wrapper
+
+
+def _release_import_slot_once():
+    """Return a callback that releases the CSV import slot on its first call and does nothing after."""
+    release_lock = threading.Lock()
+    released = False
+
+    def release():
+        nonlocal released
+        with release_lock:
+            if released:
+                return
+            released = True
+        csv_import_semaphore.release()
+
+    return release
+
+
+def check_utf8_upload(stream):
+    """Decode an upload chunk by chunk, raising UnicodeDecodeError if it isn't UTF-8, then rewind it."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in iter(functools.partial(stream.read, CSV_ENCODING_CHECK_CHUNK_SIZE), b""):
+        decoder.decode(chunk)
+    decoder.decode(b"", final=True)
+    stream.seek(0)
+
 
 def check_for_duplicate_item(cursor, category_id, category_type, title, director=None, year=None, author=None):
     """
@@ -177,10 +250,37 @@ def check_for_duplicate_item(cursor, category_id, category_type, title, director
         return False, None
 
     except Exception as e:
-        print(f"Error checking for duplicate: {e}")
+        logger.error("Error checking for duplicate: %s", e)
         return False, None
 
 
+def insert_movie_items(cursor, rows):
+    """Insert (category_id, name, title, director, year, url, price) rows as unbought items."""
+    cursor.executemany(
+        """
+        INSERT INTO items (category_id, name, title, director, year, url, price, bought)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+    """,
+        rows,
+    )
+
+
+def get_movie_category(cursor, category_id):
+    """
+    Look up a category that movies can be imported into.
+    Returns (category_row, error_response) tuple; exactly one of them is None.
+    """
+    category_row = get_category(cursor, category_id)
+
+    if not category_row:
+        return None, (jsonify({"error": "Category not found"}), 404)
+
+    if category_row[1] != "movies":
+        return None, (jsonify({"error": 'Category must be of type "movies"'}), 400)
+
+    return category_row, None
+
+
 @movies_bp.route("/search", methods=["GET", "POST"])
 def search_movies():
     """Search for movies using Apple Store API."""
@@ -202,11 +302,12 @@ def search_movies():
         return jsonify(results)
 
     except Exception as e:
-        print(f"Movie search error: {e}")
+        logger.error("Movie search error: %s", e)
         return jsonify({"error": "Failed to search movies"}), 500
 
 
 @movies_bp.route("/preview-csv", methods=["POST"])
+@limit_concurrent_imports
 def preview_csv():
     """Preview CSV import - parse and search without importing to database."""
     try:
@@ -231,25 +332,18 @@ def preview_csv():
         # Verify category exists and is a movie category
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT id, type, name FROM categories WHERE id = ?", (category_id,))
-        category_row = cursor.fetchone()
-
-        if not category_row:
+        category_row, error_response = get_movie_category(cursor, category_id)
+        if error_response:
             conn.close()
-            return jsonify({"error": "Category not found"}), 404
+            return error_response
 
         category_type = category_row[1]
         category_name = category_row[2]
 
-        if category_type != "movies":
-            conn.close()
-            return jsonify({"error": 'Category must be of type "movies"'}), 400
-
         # Parse CSV file
         try:
-            # Read file content and decode
-            file_content = file.read().decode("utf-8")
-            csv_reader = csv.DictReader(io.StringIO(file_content))
+            # Decode the upload lazily so rows are read one at a time
+            csv_reader = csv.DictReader(io.TextIOWrapper(file.stream, encoding="utf-8", newline=""))
 
             # Validate CSV headers
             headers = csv_reader.fieldnames
@@ -259,14 +353,16 @@ def preview_csv():
                     400,
                 )
 
-            movies_to_preview = list(csv_reader)
+            first_row = next(csv_reader, None)
 
         except Exception as e:
             return jsonify({"error": f"Failed to parse CSV file: {str(e)}"}), 400
 
-        if not movies_to_preview:
+        if first_row is None:
             return jsonify({"error": "CSV file is empty or has no valid rows"}), 400
 
+        movies_to_preview = itertools.chain([first_row], csv_reader)
+
         # Process each movie - search but don't import
         preview_results = []
 
@@ -330,18 +426,18 @@ def preview_csv():
                         error_msg = search_results.get("error") or f"No results found for '{title}'"
 
                 # Log debug info for CSV preview (only if not duplicate)
-                if not is_duplicate and search_results.get("debug"):
+                if not is_duplicate and search_results.get("debug") and logger.isEnabledFor(logging.DEBUG):
                     debug_info = search_results["debug"]
-                    print(f"🔍 DEBUG CSV Import - Row {i+1} ({title}):")
-                    print(f"  Original query: {debug_info['original_query']}")
-                    print(f"  Search strategies: {debug_info['search_strategies']}")
+                    logger.debug("🔍 CSV Import - Row %d (%s):", i + 1, title)
+                    logger.debug("  Original query: %s", debug_info["original_query"])
+                    logger.debug("  Search strategies: %s", debug_info["search_strategies"])
                     for api_call in debug_info["api_calls"]:
-                        print(f"  API Call: {api_call['search_term']}")
-                        print(f"    URL: {api_call['url']}")
-                        print(f"    Status: {api_call['status_code']}")
-                        print(f"    Results: {api_call['results_count']}")
+                        logger.debug("  API Call: %s", api_call["search_term"])
+                        logger.debug("    URL: %s", api_call["url"])
+                        logger.debug("    Status: %s", api_call["status_code"])
+                        logger.debug("    Results: %s", api_call["results_count"])
                         if api_call["error"]:
-                            print(f"    Error: {api_call['error']}")
+                            logger.debug("    Error: %s", api_call["error"])
 
                 # Build result object
                 result_obj = {
@@ -390,9 +486,7 @@ def preview_csv():
                         csv_data["title"],
                         csv_data["director"],
                         csv_data["year"],
-                        requests.utils.quote(
-                            f"{csv_data['title']}|{csv_data['director'] or ''}|{csv_data['year'] or ''}"
-                        ),
+                        quote(f"{csv_data['title']}|{csv_data['director'] or ''}|{csv_data['year'] or ''}"),
                     ),
                 )
 
@@ -468,8 +562,12 @@ def preview_csv():
             }
         )
 
+    except (UnicodeDecodeError, csv.Error) as e:
+        # Rows are decoded as they are previewed, so a bad byte or malformed row can turn up mid-file
+        return jsonify({"error": f"Failed to parse CSV file: {str(e)}"}), 400
+
     except Exception as e:
-        print(f"CSV preview error: {e}")
+        logger.error("CSV preview error: %s", e)
         return jsonify({"error": "Failed to preview CSV file"}), 500
 
 
@@ -490,20 +588,13 @@ def import_confirmed():
         # Verify category exists and is a movie category
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT id, type, name FROM categories WHERE id = ?", (category_id,))
-        category_row = cursor.fetchone()
-
-        if not category_row:
+        category_row, error_response = get_movie_category(cursor, category_id)
+        if error_response:
             conn.close()
-            return jsonify({"error": "Category not found"}), 404
+            return error_response
 
-        category_type = category_row[1]
         category_name = category_row[2]
 
-        if category_type != "movies":
-            conn.close()
-            return jsonify({"error": 'Category must be of type "movies"'}), 400
-
         # Import confirmed movies
         results = {
             "total": len(confirmed_movies),
@@ -524,7 +615,7 @@ def import_confirmed():
                 year = movie_data.get("year")
                 url = movie_data.get(
                     "url",
-                    f"https://tv.apple.com/search?term={requests.utils.quote(title)}",
+                    f"https://tv.apple.com/search?term={quote(title)}",
                 )
                 price = movie_data.get("price", 0.0)
 
@@ -533,13 +624,16 @@ def import_confirmed():
                     """
                     INSERT INTO items (category_id, name, title, director, year, url, price, bought)
                     VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+                    RETURNING id
                 """,
                     (category_id, display_name, title, director, year, url, price),
                 )
+                item_id = cursor.fetchone()[0]
 
                 results["imported"] += 1
                 results["imported_movies"].append(
                     {
+                        "id": item_id,
                         "title": title,
                         "director": director,
                         "year": year,
@@ -551,8 +645,7 @@ def import_confirmed():
             except Exception as e:
                 results["failed"] += 1
                 results["errors"].append(f"Movie {i+1}: {str(e)}")
-                print(f"Error importing movie {i+1}: {e}")
-                print(f"Movie data: {movie_data}")
+                logger.warning("Error importing movie %d: %s (movie data: %s)", i + 1, e, movie_data)
                 continue
 
         conn.commit()
@@ -568,7 +661,7 @@ def import_confirmed():
         )
 
     except Exception as e:
-        print(f"Confirmed import error: {e}")
+        logger.error("Confirmed import error: %s", e)
         return jsonify({"error": "Failed to import confirmed movies"}), 500
 
 
@@ -633,6 +726,7 @@ def process_pending():
                         """
                         INSERT INTO items (category_id, name, title, director, year, url, price, bought)
                         VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+                        RETURNING id
                     """,
                         (
                             category_id,
@@ -644,6 +738,7 @@ def process_pending():
                             movie["price"],
                         ),
                     )
+                    item_id = cursor.fetchone()[0]
 
                     # Mark as completed
                     cursor.execute(
@@ -656,11 +751,11 @@ def process_pending():
                     )
 
                     imported += 1
-                    print(f"✅ Imported pending movie: {title}")
+                    logger.info("✅ Imported pending movie: %s (item %s)", title, item_id)
 
                 elif search_results.get("rate_limited"):
                     # Still rate limited - stop processing
-                    print("🚦 Still rate limited, stopping batch processing")
+                    logger.info("🚦 Still rate limited, stopping batch processing")
                     break
 
                 elif retry_count >= 3:
@@ -674,16 +769,16 @@ def process_pending():
                         (search_id,),
                     )
                     failed += 1
-                    print(f"❌ Failed to find movie after 3 retries: {title}")
+                    logger.info("❌ Failed to find movie after 3 retries: %s", title)
 
                 else:
                     # Still not found but haven't hit max retries
-                    print(f"🔍 Movie still not found, will retry: {title}")
+                    logger.info("🔍 Movie still not found, will retry: %s", title)
 
                 processed += 1
 
             except Exception as e:
-                print(f"Error processing pending search {search_id}: {e}")
+                logger.warning("Error processing pending search %s: %s", search_id, e)
                 continue
 
         conn.commit()
@@ -700,7 +795,7 @@ def process_pending():
         )
 
     except Exception as e:
-        print(f"Process pending error: {e}")
+        logger.error("Process pending error: %s", e)
         return jsonify({"error": "Failed to process pending searches"}), 500
 
 
@@ -737,23 +832,17 @@ def add_manual_movie():
         # Verify category exists and is a movie category
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT id, type, name FROM categories WHERE id = ?", (category_id,))
-        category_row = cursor.fetchone()
-
-        if not category_row:
+        _, error_response = get_movie_category(cursor, category_id)
+        if error_response:
             conn.close()
-            return jsonify({"error": "Category not found"}), 404
-
-        if category_row[1] != "movies":
-            conn.close()
-            return jsonify({"error": 'Category must be of type "movies"'}), 400
+            return error_response
 
         # Create display name
         display_name = f"{title} ({year})" if year else title
 
         # Set defaults for optional fields
         if not url:
-            url = f"https://tv.apple.com/search?term={requests.utils.quote(title)}"
+            url = f"https://tv.apple.com/search?term={quote(title)}"
         if price is None:
             price = 0.00
         if not director:
@@ -764,9 +853,11 @@ def add_manual_movie():
             """
             INSERT INTO items (category_id, name, title, director, year, url, price, bought)
             VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+            RETURNING id
         """,
             (category_id, display_name, title, director, year, url, price),
         )
+        item_id = cursor.fetchone()[0]
 
         conn.commit()
         conn.close()
@@ -776,6 +867,7 @@ def add_manual_movie():
                 "success": True,
                 "message": f'Added "{title}" manually to category',
                 "movie": {
+                    "id": item_id,
                     "title": title,
                     "director": director,
                     "year": year,
@@ -787,11 +879,12 @@ def add_manual_movie():
         )
 
     except Exception as e:
-        print(f"Manual movie add error: {e}")
+        logger.error("Manual movie add error: %s", e)
         return jsonify({"error": "Failed to add movie manually"}), 500
 
 
 @movies_bp.route("/import-csv", methods=["POST"])
+@limit_concurrent_imports
 def import_csv():
     """Import movies from CSV file and add them to a category."""
     try:
@@ -819,25 +912,21 @@ def import_csv():
         # Verify category exists and is a movie category
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT id, type, name FROM categories WHERE id = ?", (category_id,))
-        category_row = cursor.fetchone()
-
-        if not category_row:
+        category_row, error_response = get_movie_category(cursor, category_id)
+        if error_response:
             conn.close()
-            return jsonify({"error": "Category not found"}), 404
+            return error_response
 
-        category_type = category_row[1]
         category_name = category_row[2]
 
-        if category_type != "movies":
-            conn.close()
-            return jsonify({"error": 'Category must be of type "movies"'}), 400
-
         # Parse CSV file
         try:
-            # Read file content and decode
-            file_content = file.read().decode("utf-8")
-            csv_reader = csv.DictReader(io.StringIO(file_content))
+            # Once the response starts streaming its status can't change, so reject an upload
+            # that isn't UTF-8 before any row is imported
+            check_utf8_upload(file.stream)
+
+            # Decode the upload lazily so rows are read one at a time
+            csv_reader = csv.DictReader(io.TextIOWrapper(file.stream, encoding="utf-8", newline=""))
 
             # Validate CSV headers
             headers = csv_reader.fieldnames
@@ -847,115 +936,168 @@ def import_csv():
                     400,
                 )
 
-            movies_to_import = list(csv_reader)
+            first_row = next(csv_reader, None)
 
         except Exception as e:
             return jsonify({"error": f"Failed to parse CSV file: {str(e)}"}), 400
 
-        if not movies_to_import:
+        if first_row is None:
             return jsonify({"error": "CSV file is empty or has no valid rows"}), 400
 
+        movies_to_import = itertools.chain([first_row], csv_reader)
+
         # Process each movie
         results = {
-            "total": len(movies_to_import),
+            "total": 0,
             "imported": 0,
             "failed": 0,
             "errors": [],
-            "imported_movies": [],
         }
 
-        for i, row in enumerate(movies_to_import):
-            try:
-                title = row.get("title", "").strip()
-                director = row.get("director", "").strip() or None
-                year_str = row.get("year", "").strip()
-                year = None
+        def rows_to_search():
+            """Parse and validate CSV rows as the lookups pull them, yielding (row_index, title, director, year)."""
+            for i, row in enumerate(movies_to_import):
+                results["total"] += 1
+                try:
+                    title = row.get("title", "").strip()
+                    director = row.get("director", "").strip() or None
+                    year_str = row.get("year", "").strip()
+                    year = None
+
+                    if not title:
+                        results["failed"] += 1
+                        results["errors"].append(f"Row {i+1}: Missing title")
+                        continue
 
-                if not title:
+                    # Parse year if provided
+                    if year_str:
+                        try:
+                            year = int(year_str)
+                        except ValueError:
+                            results["errors"].append(f"Row {i+1}: Invalid year '{year_str}', ignoring")
+
+                    yield i, title, director, year
+
+                except Exception as e:
                     results["failed"] += 1
-                    results["errors"].append(f"Row {i+1}: Missing title")
-                    continue
+                    results["errors"].append(f"Row {i+1}: {str(e)}")
 
-                # Parse year if provided
-                if year_str:
-                    try:
-                        year = int(year_str)
-                    except ValueError:
-                        results["errors"].append(f"Row {i+1}: Invalid year '{year_str}', ignoring")
+        def generate():
+            """
+            Stream the import response as it is built: imported movies are written out batch by batch
+            once each batch is committed, and the counts, errors and message close the document.
+            """
+            stopped_early = False
+            yield b'{"results": {"imported_movies": ['
 
-                # Search for movie on Apple Store
-                search_results = search_apple_movies(title)
+            # Resolved movies not yet written, as (insert row, movie JSON) pairs
+            pending = []
+
+            def commit_pending():
+                """Write and commit the pending movies, returning their JSON now that they are stored."""
+                insert_movie_items(cursor, [insert_row for insert_row, _ in pending])
+                conn.commit()
+                results["imported"] += len(pending)
+                imported_movies = b",".join(imported_movie for _, imported_movie in pending)
+                pending.clear()
+                return imported_movies
+
+            try:
+                # Parse rows, look movies up on Apple Store and write resolved movies in batches as
+                # overlapping stages; a malformed row later in the file stops the import like any failure
+                separator = b""
 
-                if not search_results.get("movies") or len(search_results["movies"]) == 0:
-                    if skip_not_found:
+                for (i, title, director, year), search_results in iter_apple_movie_searches(
+                    rows_to_search(), lambda r: r[1]
+                ):
+                    try:
+                        if not search_results.get("movies") or len(search_results["movies"]) == 0:
+                            if skip_not_found:
+                                results["failed"] += 1
+                                error_msg = search_results.get("error", f"No results found for '{title}'")
+                                results["errors"].append(f"Row {i+1}: {error_msg}")
+                                continue
+                            else:
+                                # Create a placeholder entry with estimated pricing
+                                movie = {
+                                    "title": title,
+                                    "director": director or "Unknown Director",
+                                    "year": year,
+                                    "name": f"{title} ({year})" if year else title,
+                                    "price": 7.99,  # Default estimated price
+                                    "url": f"https://tv.apple.com/search?term={quote(title)}",
+                                    "priceSource": "manual_entry",
+                                }
+                        else:
+                            # Use the first (best) result from Apple Store
+                            movie = search_results["movies"][0]
+
+                        # Create display name
+                        display_name = movie.get("name") or f"{movie['title']} ({movie.get('year', 'Unknown')})"
+
+                        insert_row = (
+                            category_id,
+                            display_name,
+                            movie["title"],
+                            movie.get("director") or director,  # Use CSV director if Apple doesn't have one
+                            movie.get("year") or year,  # Use CSV year if Apple doesn't have one
+                            movie["url"],
+                            movie["price"],
+                        )
+
+                        imported_movie = orjson.dumps(
+                            {
+                                "title": movie["title"],
+                                "director": movie.get("director"),
+                                "year": movie.get("year"),
+                                "price": movie["price"],
+                                "priceSource": movie.get("priceSource", "apple"),
+                            }
+                        )
+
+                    except Exception as e:
                         results["failed"] += 1
-                        error_msg = search_results.get("error", f"No results found for '{title}'")
-                        results["errors"].append(f"Row {i+1}: {error_msg}")
+                        results["errors"].append(f"Row {i+1}: {str(e)}")
                         continue
-                    else:
-                        # Create a placeholder entry with estimated pricing
-                        movie = {
-                            "title": title,
-                            "director": director or "Unknown Director",
-                            "year": year,
-                            "name": f"{title} ({year})" if year else title,
-                            "price": 7.99,  # Default estimated price
-                            "url": f"https://tv.apple.com/search?term={requests.utils.quote(title)}",
-                            "priceSource": "manual_entry",
-                        }
-                else:
-                    # Use the first (best) result from Apple Store
-                    movie = search_results["movies"][0]
 
-                # Create display name
-                display_name = movie.get("name") or f"{movie['title']} ({movie.get('year', 'Unknown')})"
+                    pending.append((insert_row, imported_movie))
+                    if len(pending) >= CSV_INSERT_BATCH_SIZE:
+                        yield separator + commit_pending()
+                        separator = b","
 
-                # Insert into database
-                cursor.execute(
-                    """
-                    INSERT INTO items (category_id, name, title, director, year, url, price, bought)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, 0)
-                """,
-                    (
-                        category_id,
-                        display_name,
-                        movie["title"],
-                        movie.get("director") or director,  # Use CSV director if Apple doesn't have one
-                        movie.get("year") or year,  # Use CSV year if Apple doesn't have one
-                        movie["url"],
-                        movie["price"],
-                    ),
-                )
-
-                results["imported"] += 1
-                results["imported_movies"].append(
-                    {
-                        "title": movie["title"],
-                        "director": movie.get("director"),
-                        "year": movie.get("year"),
-                        "price": movie["price"],
-                        "priceSource": movie.get("priceSource", "apple"),
-                    }
-                )
+                if pending:
+                    yield separator + commit_pending()
 
             except Exception as e:
-                results["failed"] += 1
-                results["errors"].append(f"Row {i+1}: {str(e)}")
-                continue
+                # Headers are already sent, so report the failure in the body. Batches committed
+                # before it stay imported; only the batch still pending is rolled back
+                logger.error("CSV import error: %s", e)
+                conn.rollback()
+                results["failed"] += len(pending)
+                results["errors"].append(f"Import stopped early: {str(e)}")
+                stopped_early = True
+
+            finally:
+                conn.close()
+
+            # A partial import is still reported as a success, with the count of movies stored
+            success = results["imported"] > 0 or not stopped_early
+            if not success:
+                message = "Failed to import CSV file"
+            elif stopped_early:
+                message = (
+                    f'Imported {results["imported"]} movies into "{category_name}" category before the import stopped'
+                )
+            else:
+                message = f'Imported {results["imported"]} movies into "{category_name}" category'
 
-        conn.commit()
-        conn.close()
+            yield b"], " + orjson.dumps(results)[1:]
+            yield b', "success": ' + orjson.dumps(success) + b', "message": ' + orjson.dumps(message) + b"}"
 
-        return jsonify(
-            {
-                "success": True,
-                "message": f'Imported {results["imported"]} movies into "{category_name}" category',
-                "results": results,
-            }
-        )
+        return Response(stream_with_context(generate()), mimetype="application/json")
 
     except Exception as e:
-        print(f"CSV import error: {e}")
+        logger.error("CSV import error: %s", e)
         return jsonify({"error": "Failed to import CSV file"}), 500
 
 
@@ -1014,7 +1156,7 @@ def create_batch_search():
         )
 
     except Exception as e:
-        print(f"Batch search creation error: {e}")
+        logger.error("Batch search creation error: %s", e)
         return jsonify({"error": "Failed to create batch search"}), 500
 
 
@@ -1043,7 +1185,7 @@ def get_batch_search_status(category_id):
         )
 
     except Exception as e:
-        print(f"Batch search status error: {e}")
+        logger.error("Batch search status error: %s", e)
         return jsonify({"error": "Failed to get batch search status"}), 500
 
 
@@ -1092,7 +1234,7 @@ def process_batch_search(category_id):
                 processed += 1
 
             except Exception as e:
-                print(f"Error processing pending search {pending.id}: {e}")
+                logger.warning("Error processing pending search %s: %s", pending.id, e)
                 pending.status = "failed"
                 processed += 1
 
@@ -1101,7 +1243,7 @@ def process_batch_search(category_id):
         return jsonify({"success": True, "processed": processed, "imported": imported})
 
     except Exception as e:
-        print(f"Batch search processing error: {e}")
+        logger.error("Batch search processing error: %s", e)
         return jsonify({"error": "Failed to process batch search"}), 500
 
 
@@ -1119,5 +1261,5 @@ def cancel_batch_search(category_id):
         )
 
     except Exception as e:
-        print(f"Batch search cancellation error: {e}")
+        logger.error("Batch search cancellation error: %s", e)
         return jsonify({"error": "Failed to cancel batch search"}), 500
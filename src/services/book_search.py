@@ -2,21 +2,57 @@
 Book search service for integrating with external APIs.
 """
 
+import logging
 from typing import Any, Dict
+from urllib.parse import quote
 
-import requests
+import orjson
+
+from src.config import Config
+from src.services.cache import TTLCache
+from src.services.http import create_session, stable_jitter
+
+logger = logging.getLogger(__name__)
+
+# Pooled connection to the Google Books API
+http_session = create_session()
+
+# Successful Google Books responses as orjson bytes, keyed by normalised query; decoded on every
+# read so callers get their own copy
+_search_cache = TTLCache(maxsize=1024, ttl=Config.SEARCH_CACHE_TTL)
+
+# Approximate conversion rates to GBP for Google Books list prices
+_FX = {"GBP": 1.0, "USD": 0.79, "EUR": 0.86}
 
 
 def search_google_books(query: str) -> Dict[str, Any]:
+    """Search Google Books API, reusing recent results for the same query."""
+    cache_key = query.strip().lower()
+    cached = _search_cache.get(cache_key)
+    if cached is not None:
+        return orjson.loads(cached)
+
+    result = _search_google_books(query)
+    if result.get("source") == "google_books":
+        _search_cache.set(cache_key, orjson.dumps(result))
+    return result
+
+
+def clear_book_search_cache():
+    """Forget all cached Google Books responses."""
+    _search_cache.clear()
+
+
+def _search_google_books(query: str) -> Dict[str, Any]:
     """Search Google Books API."""
     try:
         url = f"https://www.googleapis.com/books/v1/volumes?q={query}&maxResults=10&printType=books&country=GB"
-        response = requests.get(url, timeout=10)
+        response = http_session.get(url, timeout=10)
 
         if not response.ok:
             return get_mock_results(query)
 
-        data = response.json()
+        data = orjson.loads(response.content)
         if not data.get("items"):
             return get_mock_results(query)
 
@@ -30,7 +66,7 @@ def search_google_books(query: str) -> Dict[str, Any]:
                 continue
 
             price = generate_realistic_price(volume_info, sale_info)
-            kobo_url = f"https://www.kobo.com/gb/en/search?query={requests.utils.quote(title)}"
+            kobo_url = f"https://www.kobo.com/gb/en/search?query={quote(title)}"
 
             author = ", ".join(volume_info.get("authors", [])) or "Unknown Author"
             display_name = f"{title} by {author}"
@@ -59,7 +95,7 @@ def search_google_books(query: str) -> Dict[str, Any]:
         return {"books": books, "total": len(books), "source": "google_books"}
 
     except Exception as e:
-        print(f"Book search error: {e}")
+        logger.warning("Book search error: %s", e)
         return get_mock_results(query)
 
 
@@ -67,13 +103,7 @@ def generate_realistic_price(volume_info: Dict, sale_info: Dict) -> float:
     """Generate realistic book prices."""
     list_price = sale_info.get("listPrice")
     if list_price and list_price.get("amount"):
-        price = float(list_price["amount"])
-        currency = list_price.get("currencyCode", "GBP")
-
-        if currency == "USD":
-            price *= 0.79
-
-        return round(price, 2)
+        return round(float(list_price["amount"]) * _FX.get(list_price.get("currencyCode"), 1.0), 2)
 
     # Generate based on book characteristics
     page_count = volume_info.get("pageCount", 250)
@@ -86,10 +116,7 @@ def generate_realistic_price(volume_info: Dict, sale_info: Dict) -> float:
     elif page_count < 150:
         base_price = 6.99
 
-    import random
-
-    variation = (random.random() - 0.5) * 2
-    base_price += variation
+    base_price += stable_jitter(volume_info.get("title", ""), 2.0)
 
     return round(max(2.99, min(19.99, base_price)), 2)
 
@@ -134,7 +161,7 @@ def get_mock_results(query: str) -> Dict[str, Any]:
             "author": data["author"],
             "name": display_name,
             "price": data["price"],
-            "url": f"https://www.kobo.com/gb/en/search?query={requests.utils.quote(query)}",
+            "url": f"https://www.kobo.com/gb/en/search?query={quote(query)}",
             "priceSource": data["priceSource"],
         }
         mock_books.append(book)
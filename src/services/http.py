@@ -0,0 +1,86 @@
+"""
+Shared HTTP session setup and helpers for external API calls.
+"""
+
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_session(user_agent: Optional[str] = None) -> requests.Session:
+    """Create a requests session that keeps connections to API hosts alive."""
+    session = requests.Session()
+
+    # Retry transient upstream failures; the last response is still returned to the caller
+    retries = Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=["GET"],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    if user_agent:
+        session.headers["User-Agent"] = user_agent
+
+    return session
+
+
+class RateLimiter:
+    """Thread-safe sliding-window limiter allowing max_calls per period seconds."""
+
+    def __init__(self, max_calls: int, period: float):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait: float) -> bool:
+        """Take a slot, sleeping up to max_wait seconds for one; False if none frees up in time."""
+        deadline = time.monotonic() + max_wait
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._expire(now)
+
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return True
+
+                wait = self.period - (now - self._calls[0])
+                if now + wait > deadline:
+                    return False
+
+            # Sleep without the lock so other callers are served or turned away meanwhile,
+            # then check again since they may have taken the slot that freed up
+            time.sleep(wait)
+
+    def available(self) -> int:
+        """Number of calls that could be made right now without waiting."""
+        with self._lock:
+            self._expire(time.monotonic())
+            return self.max_calls - len(self._calls)
+
+    def reset(self):
+        """Forget all recorded calls."""
+        with self._lock:
+            self._calls.clear()
+
+    def _expire(self, now: float):
+        """Drop calls that have left the window; the caller holds the lock."""
+        while self._calls and now - self._calls[0] >= self.period:
+            self._calls.popleft()
+
+
+def stable_jitter(key: str, span: float) -> float:
+    """Offset in [-span/2, span/2] derived from key, so an API result always gets the same estimate."""
+    return ((zlib.crc32(key.encode("utf-8")) & 0xFFFF) / 0xFFFF - 0.5) * span
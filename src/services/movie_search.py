@@ -2,107 +2,196 @@
 Movie search service for integrating with Apple Store and other APIs.
 """
 
+import itertools
+import logging
 import re
-from typing import Any, Dict
-
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+import orjson
 import requests
 
+from src.config import Config
+from src.services.cache import TTLCache
+from src.services.http import RateLimiter, create_session, stable_jitter
+
+logger = logging.getLogger(__name__)
+
+# Pooled connection to the iTunes API, shared by all lookups
+http_session = create_session(
+    user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+)
+
+# iTunes/Apple Store Search and Lookup APIs
+ITUNES_SEARCH_URL = "https://itunes.apple.com/search"
+ITUNES_LOOKUP_URL = "https://itunes.apple.com/lookup"
+
+# Search parameters shared by every query; the term is added per call
+ITUNES_SEARCH_PARAMS = {
+    "media": "movie",
+    "country": "GB",  # UK store
+    "limit": 15,  # Increased limit for better results
+    "entity": "movie",
+}
+_ITUNES_SEARCH_QUERY = urlencode(ITUNES_SEARCH_PARAMS)
+
+# Movies returned by one search; iTunes is asked for more so untitled items don't use up slots
+APPLE_SEARCH_MAX_RESULTS = 10
+
+# Upper bound on concurrent iTunes Search API calls made by batch lookups,
+# and how many lookups may be queued ahead of the rows being processed
+APPLE_SEARCH_MAX_WORKERS = 8
+APPLE_SEARCH_PREFETCH = APPLE_SEARCH_MAX_WORKERS * 2
+
+# Runs the query variations of a single search concurrently; kept separate from the
+# pool in iter_apple_movie_searches, whose workers submit to it
+_variation_executor = ThreadPoolExecutor(max_workers=APPLE_SEARCH_MAX_WORKERS, thread_name_prefix="itunes-search")
+
+# Apple allows ~20 calls/minute; stay just under it rather than waiting for a 403.
+# Calls that would have to wait longer than the max wait are reported as rate limited.
+itunes_rate_limiter = RateLimiter(max_calls=18, period=60)
+ITUNES_RATE_LIMIT_MAX_WAIT = 5
+
+# Every variation sent costs a limiter slot even if an earlier one answers, so fallback
+# variations are only sent alongside the original query while this many slots are free
+ITUNES_CONCURRENT_VARIATIONS_MIN_FREE = 9
+
+# Track IDs sent in one iTunes /lookup call when refreshing many movies at once
+ITUNES_LOOKUP_BATCH_SIZE = 100
+
+# Longest description kept on a movie result; full iTunes synopses can run to several KB
+MOVIE_DESCRIPTION_MAX_LENGTH = 500
+
+# First 4-digit run in a release date string, e.g. "2023-07-15T07:00:00Z"
+_YEAR_RE = re.compile(r"(\d{4})")
+
+# iTunes price fields in priority order: HD purchase > standard purchase > collection > rental
+_PRICE_FIELDS = (
+    ("trackHdPrice", "apple_hd_purchase"),
+    ("trackPrice", "apple_purchase"),
+    ("collectionPrice", "apple_collection"),
+    ("trackRentalPrice", "apple_rental"),
+)
+
+# Sort rank of each Apple price source; estimated/unknown sources rank after all of them
+_PRICE_PRIORITY = {source: rank for rank, (_, source) in enumerate(_PRICE_FIELDS)}
+
+# Successful lookups, keyed by normalised query and by track ID. Results are stored as orjson
+# bytes and decoded on every read, so callers get their own copy and can't change the cache.
+_search_cache = TTLCache(maxsize=1024, ttl=Config.SEARCH_CACHE_TTL)
+_track_cache = TTLCache(maxsize=1024, ttl=Config.SEARCH_CACHE_TTL)
+
+# Searches currently running, keyed like _search_cache; each future holds the result as orjson bytes
+_inflight_searches: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+# Longest a caller waits on another caller's identical search before looking the title up itself;
+# the shared search can include several variations, rate limiter waits and retries
+APPLE_SEARCH_SHARED_WAIT = 10
+
 
 def search_apple_movies(query: str) -> Dict[str, Any]:
+    """Search Apple Store for movies, reusing recent results for the same query."""
+    cache_key = query.strip().lower()
+    cached = _search_cache.get(cache_key)
+    if cached is not None:
+        # Debug info describes this call, so it is never served from the cache
+        debug_info = {"original_query": query, "api_calls": [], "search_strategies": [], "cache_hit": True}
+        return {**orjson.loads(cached), "debug": debug_info}
+
+    # Only one lookup per query runs at a time; concurrent callers share its result
+    with _inflight_lock:
+        inflight = _inflight_searches.get(cache_key)
+        if inflight is None:
+            inflight = _inflight_searches[cache_key] = Future()
+            is_owner = True
+        else:
+            is_owner = False
+
+    if not is_owner:
+        try:
+            result = inflight.result(timeout=APPLE_SEARCH_SHARED_WAIT)
+        except FutureTimeoutError:
+            logger.info("⏱️ Shared search for '%s' still running, searching separately", query)
+            return _search_apple_movies(query)
+        debug_info = {"original_query": query, "api_calls": [], "search_strategies": [], "shared_lookup": True}
+        return {**orjson.loads(result), "debug": debug_info}
+
+    try:
+        result = _search_apple_movies(query)
+        shared = orjson.dumps({key: value for key, value in result.items() if key != "debug"})
+        if result.get("movies"):
+            _search_cache.set(cache_key, shared)
+        inflight.set_result(shared)
+        return result
+    except BaseException as e:
+        inflight.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight_searches[cache_key]
+
+
+def _search_apple_movies(query: str) -> Dict[str, Any]:
     """Search Apple Store for movies with multiple search strategies."""
     debug_info = {"original_query": query, "api_calls": [], "search_strategies": []}
 
     try:
-        # Try different search variations
-        search_queries = [
-            query.strip(),  # Original query
-            query.strip().replace(" ", "+"),  # URL encoded spaces
-            query.strip().split("(")[0].strip(),  # Remove year/parentheses if any
-        ]
+        # Try the original query, then without any year/parentheses. Spaces are
+        # URL-encoded by requests, so a "+"-joined variant would be a duplicate call.
+        base_query = query.strip()
+        search_queries = [base_query, base_query.split("(")[0].strip()]
 
         # Remove duplicates while preserving order
         search_queries = list(dict.fromkeys(search_queries))
         debug_info["search_strategies"] = search_queries
 
-        for search_query in search_queries:
-            if not search_query:
-                continue
-
-            # Use iTunes/Apple Store Search API
-            url = "https://itunes.apple.com/search"
-            params = {
-                "term": search_query,
-                "media": "movie",
-                "country": "GB",  # UK store
-                "limit": 15,  # Increased limit for better results
-                "entity": "movie",
-            }
-
-            # Build full URL for debugging
-            full_url = f"{url}?{'&'.join([f'{k}={requests.utils.quote(str(v))}' for k, v in params.items()])}"
+        variations = [search_query for search_query in search_queries if search_query]
 
-            print(f"🔍 DEBUG: Searching Apple Store for '{search_query}'")
-            print(f"🌐 DEBUG: API URL: {full_url}")
+        # With limiter headroom to spare, send every variation at once so a miss on the original
+        # query costs one round trip rather than two. Otherwise fall back to the next variation
+        # only once the previous one has missed. Results are taken in order of preference either way.
+        if len(variations) > 1 and itunes_rate_limiter.available() >= ITUNES_CONCURRENT_VARIATIONS_MIN_FREE:
+            futures = [_variation_executor.submit(_fetch_search_variation, q) for q in variations]
+            outcomes = (future.result() for future in futures)
+        else:
+            futures = []
+            outcomes = map(_fetch_search_variation, variations)
 
-            api_call_info = {
-                "search_term": search_query,
-                "url": full_url,
-                "status_code": None,
-                "results_count": 0,
-                "error": None,
-            }
+        for index, (api_call_info, results, rate_limited) in enumerate(outcomes):
+            debug_info["api_calls"].append(api_call_info)
 
-            try:
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
-                }
-                response = requests.get(url, params=params, headers=headers, timeout=10)
-                api_call_info["status_code"] = response.status_code
-
-                print(f"📡 DEBUG: Status Code: {response.status_code}")
-
-                if not response.ok:
-                    api_call_info["error"] = f"HTTP {response.status_code}"
-                    print(f"❌ DEBUG: HTTP Error {response.status_code}")
-                    debug_info["api_calls"].append(api_call_info)
-
-                    # If we hit rate limiting (403), stop trying and return rate limit
-                    # info
-                    if response.status_code == 403:
-                        print("🚦 DEBUG: Rate limit detected, marking as pending")
-                        return {
-                            "movies": [],
-                            "total": 0,
-                            "error": "Rate limited by Apple Store API (20 calls/minute limit)",
-                            "rate_limited": True,
-                            "debug": debug_info,
+            if rate_limited or results:
+                # Drop variations that haven't started yet; they can only lose to this one.
+                # Any still in flight finish in the background and are ignored.
+                for future in futures:
+                    future.cancel()
+
+                for skipped_query in variations[index + 1 :]:
+                    debug_info["api_calls"].append(
+                        {
+                            "search_term": skipped_query,
+                            "url": "N/A",
+                            "status_code": None,
+                            "results_count": 0,
+                            "error": "Skipped: an earlier search variation was used",
                         }
+                    )
 
-                    continue  # Try next search variation
-
-                data = response.json()
-                results_count = len(data.get("results", []))
-                api_call_info["results_count"] = results_count
-
-                print(f"✅ DEBUG: Found {results_count} results")
+            if rate_limited:
+                return get_rate_limited_results(debug_info)
 
-                if data.get("results") and len(data["results"]) > 0:
-                    debug_info["api_calls"].append(api_call_info)
-                    # Found results, process them
-                    break
-
-            except requests.exceptions.Timeout:
-                api_call_info["error"] = "Timeout"
-                print("⏱️ DEBUG: Request timeout")
-            except requests.exceptions.RequestException as e:
-                api_call_info["error"] = str(e)
-                print(f"🚫 DEBUG: Request error: {e}")
-
-            debug_info["api_calls"].append(api_call_info)
+            if results:
+                # Found results, process them
+                break
 
         else:
             # No results found with any search variation
-            print(f"🔍 DEBUG: No results found after {len(search_queries)} search attempts")
+            logger.debug("🔍 No results found after %d search attempts", len(search_queries))
             return {
                 "movies": [],
                 "total": 0,
@@ -110,80 +199,17 @@ def search_apple_movies(query: str) -> Dict[str, Any]:
                 "debug": debug_info,
             }
 
-        movies = []
-        for item in data["results"][:10]:
-            title = item.get("trackName")
-            if not title:
-                continue
-
-            # Extract movie details
-            director = item.get("artistName", "Unknown Director")
-            year = extract_year_from_release_date(item.get("releaseDate", ""))
-            genre = item.get("primaryGenreName", "Unknown")
-
-            # Get pricing information
-            price_info = get_apple_pricing(item)
-
-            # Create Apple Store URL
-            apple_url = item.get(
-                "trackViewUrl",
-                f"https://tv.apple.com/search?term={requests.utils.quote(title)}",
-            )
-
-            # Create display name
-            display_name = f"{title} ({year})" if year else title
-
-            movie = {
-                "title": title,
-                "director": director,
-                "year": year,
-                "genre": genre,
-                "name": display_name,
-                "price": price_info["price"],
-                "url": apple_url,
-                "priceSource": price_info["source"],
-                "currency": price_info.get("currency", "GBP"),
-                "artwork": item.get("artworkUrl100", ""),
-                "description": item.get("longDescription", item.get("shortDescription", "")),
-                "trackId": item.get("trackId"),  # Store iTunes track ID for accurate price refresh
-            }
-            movies.append(movie)
-
-        # Sort movies: HD purchase first, then standard purchase, collection,
-        # rental, then by price
-        def get_price_priority(price_source):
-            if "hd_purchase" in price_source:
-                return 0  # Highest priority
-            elif "apple_purchase" in price_source:
-                return 1
-            elif "collection" in price_source:
-                return 2
-            elif "rental" in price_source:
-                return 3  # Lowest priority
-            else:
-                return 4  # Estimated/unknown
-
-        # Sort movies: standalone first, then by price source quality, then by price
-        def is_collection_movie(movie):
-            # Prefer standalone movies over collection/bundle movies
-            url = movie.get("url", "").lower()
-            description = movie.get("description", "").lower()
-            return "collection" in url or "bundle" in url or "collection" in description or "bundle" in description
-
-        movies.sort(
-            key=lambda movie: (
-                is_collection_movie(movie),  # False (standalone) comes before True (collection)
-                get_price_priority(movie["priceSource"]),
-                movie["price"] if movie["price"] else 999,
-            )
-        )
+        # Sort movies: standalone first, then by price source quality, then by price.
+        # sorted() calls the key once per movie, not once per comparison.
+        built = (movie for movie in map(_build_movie, results) if movie is not None)
+        movies = sorted(itertools.islice(built, APPLE_SEARCH_MAX_RESULTS), key=_movie_sort_key)
 
-        print(f"🎬 DEBUG: Returning {len(movies)} processed movies")
+        logger.debug("🎬 Returning %d processed movies", len(movies))
 
         return {"movies": movies, "total": len(movies), "debug": debug_info}
 
     except Exception as e:
-        print(f"💥 DEBUG: Apple movie search error: {e}")
+        logger.warning("💥 Apple movie search error: %s", e)
         debug_info["api_calls"].append(
             {
                 "error": f"Exception: {str(e)}",
@@ -197,131 +223,264 @@ def search_apple_movies(query: str) -> Dict[str, Any]:
         return {"movies": [], "total": 0, "error": f"Search failed: {str(e)}", "debug": debug_info}
 
 
-def get_movie_by_track_id(track_id: str) -> Dict[str, Any]:
-    """Get a specific movie by its iTunes track ID for accurate price refresh."""
-    try:
-        # Use iTunes lookup API for exact track ID
-        url = "https://itunes.apple.com/lookup"
-        params = {"id": track_id, "country": "GB", "entity": "movie"}
+def _fetch_search_variation(search_query: str) -> Tuple[Dict[str, Any], Optional[List[Dict]], bool]:
+    """
+    Run one iTunes Search API call.
+    Returns (api_call_info, results, rate_limited); results is None if the call failed.
+    """
+    params = {"term": search_query, **ITUNES_SEARCH_PARAMS}
+
+    # Build full URL for debugging
+    full_url = f"{ITUNES_SEARCH_URL}?term={quote(search_query)}&{_ITUNES_SEARCH_QUERY}"
 
-        print(f"🔍 DEBUG: Looking up movie by track ID: {track_id}")
+    logger.debug("🔍 Searching Apple Store for '%s'", search_query)
+    logger.debug("🌐 API URL: %s", full_url)
 
-        response = requests.get(url, params=params, timeout=10)
+    api_call_info = {
+        "search_term": search_query,
+        "url": full_url,
+        "status_code": None,
+        "results_count": 0,
+        "error": None,
+    }
+
+    if not itunes_rate_limiter.acquire(ITUNES_RATE_LIMIT_MAX_WAIT):
+        api_call_info["error"] = "Client rate limit reached"
+        logger.info("🚦 Client rate limit reached, marking as pending")
+        return api_call_info, None, True
+
+    try:
+        response = http_session.get(ITUNES_SEARCH_URL, params=params, timeout=10)
+        api_call_info["status_code"] = response.status_code
+
+        logger.debug("📡 Status Code: %s", response.status_code)
 
         if not response.ok:
-            return {
-                "movie": None,
-                "error": f"iTunes lookup failed with status {response.status_code}",
-            }
+            api_call_info["error"] = f"HTTP {response.status_code}"
+            logger.debug("❌ HTTP Error %s", response.status_code)
+
+            # If we hit rate limiting (403), stop trying and return rate limit info
+            if response.status_code == 403:
+                logger.warning("🚦 Rate limit detected, marking as pending")
+                return api_call_info, None, True
+
+            return api_call_info, None, False
 
-        data = response.json()
+        data = orjson.loads(response.content)
         results = data.get("results", [])
+        api_call_info["results_count"] = len(results)
 
-        if not results:
-            return {"error": "Movie not found"}
+        logger.debug("✅ Found %d results", len(results))
 
-        item = results[0]
-        title = item.get("trackName")
+        return api_call_info, results, False
 
-        if not title:
-            return {"movie": None, "error": "Invalid movie data returned"}
+    except requests.exceptions.Timeout:
+        api_call_info["error"] = "Timeout"
+        logger.debug("⏱️ Request timeout")
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        api_call_info["error"] = str(e)
+        logger.debug("🚫 Request error: %s", e)
 
-        # Extract movie details (same as search_apple_movies)
-        director = item.get("artistName", "Unknown Director")
-        year = extract_year_from_release_date(item.get("releaseDate", ""))
-        genre = item.get("primaryGenreName", "Unknown")
+    return api_call_info, None, False
 
-        # Get pricing information
-        price_info = get_apple_pricing(item)
 
-        # Create Apple Store URL
-        apple_url = item.get(
-            "trackViewUrl",
-            f"https://tv.apple.com/search?term={requests.utils.quote(title)}",
-        )
+def iter_apple_movie_searches(rows: Iterable[Any], get_query: Callable[[Any], str]) -> Iterator[Tuple[Any, Dict]]:
+    """
+    Search Apple Store for each row on a thread pool, yielding (row, results) in input order.
+    Rows are pulled lazily, so a caller that passes a lazily parsed iterable has parsing, lookups
+    and its own processing overlap, with only a small window of lookups in flight at once.
+    """
+    with ThreadPoolExecutor(max_workers=APPLE_SEARCH_MAX_WORKERS) as executor:
+        in_flight = deque()
+        for row in rows:
+            in_flight.append((row, executor.submit(search_apple_movies, get_query(row))))
+            if len(in_flight) >= APPLE_SEARCH_PREFETCH:
+                row, future = in_flight.popleft()
+                yield row, future.result()
+
+        while in_flight:
+            row, future = in_flight.popleft()
+            yield row, future.result()
 
-        # Create display name
-        display_name = f"{title} ({year})" if year else title
 
-        movie = {
-            "title": title,
-            "director": director,
-            "year": year,
-            "genre": genre,
-            "name": display_name,
-            "price": price_info["price"],
-            "url": apple_url,
-            "priceSource": price_info["source"],
-            "currency": price_info.get("currency", "GBP"),
-            "artwork": item.get("artworkUrl100", ""),
-            "description": item.get("longDescription", item.get("shortDescription", "")),
-            "trackId": item.get("trackId"),
-        }
+def get_movie_by_track_id(track_id: str) -> Dict[str, Any]:
+    """Get a specific movie by its iTunes track ID, reusing recent lookups."""
+    return get_movies_by_track_ids([track_id])[str(track_id)]
+
+
+def get_movies_by_track_ids(track_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Get movies for many iTunes track IDs, looking up up to ITUNES_LOOKUP_BATCH_SIZE IDs per API call.
+    Returns a {track_id: result} dict where each result has the same shape as get_movie_by_track_id's.
+    """
+    results = {}
+    uncached = []
+    for track_id in dict.fromkeys(str(track_id) for track_id in track_ids):
+        cached = _track_cache.get(track_id)
+        if cached is not None:
+            results[track_id] = orjson.loads(cached)
+        else:
+            uncached.append(track_id)
+
+    for start in range(0, len(uncached), ITUNES_LOOKUP_BATCH_SIZE):
+        for track_id, result in _lookup_track_ids(uncached[start : start + ITUNES_LOOKUP_BATCH_SIZE]).items():
+            if result.get("movie"):
+                _track_cache.set(track_id, orjson.dumps(result))
+            results[track_id] = result
 
-        print(f"✅ DEBUG: Found movie: {title} - £{price_info['price']} ({price_info['source']})")
+    return results
 
-        return {"movie": movie, "error": None}
+
+def clear_movie_search_cache():
+    """Forget all cached Apple Store responses."""
+    _search_cache.clear()
+    _track_cache.clear()
+
+
+def _lookup_track_ids(track_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Get movies for a batch of iTunes track IDs with a single lookup API call."""
+    try:
+        # The lookup API accepts a comma-separated list of track IDs
+        params = {"id": ",".join(track_ids), "country": "GB", "entity": "movie"}
+
+        logger.debug("🔍 Looking up movies by track ID: %s", params["id"])
+
+        if not itunes_rate_limiter.acquire(ITUNES_RATE_LIMIT_MAX_WAIT):
+            error = {"movie": None, "error": "Rate limited by Apple Store API (20 calls/minute limit)"}
+            return dict.fromkeys(track_ids, error)
+
+        response = http_session.get(ITUNES_LOOKUP_URL, params=params, timeout=10)
+
+        if not response.ok:
+            error = {"movie": None, "error": f"iTunes lookup failed with status {response.status_code}"}
+            return dict.fromkeys(track_ids, error)
+
+        data = orjson.loads(response.content)
+        found = data.get("results", [])
+        items = {str(item.get("trackId")): item for item in found}
+
+        # Some IDs resolve to a collection or a different track ID. A single-ID lookup takes the
+        # first result as it always has; only batches need the IDs to map results back.
+        if len(track_ids) == 1 and found and track_ids[0] not in items:
+            items[track_ids[0]] = found[0]
 
     except Exception as e:
-        print(f"💥 DEBUG: Track ID lookup error: {e}")
-        return {"movie": None, "error": f"Failed to lookup movie: {str(e)}"}
+        logger.warning("💥 Track ID lookup error: %s", e)
+        return dict.fromkeys(track_ids, {"movie": None, "error": f"Failed to lookup movie: {str(e)}"})
+
+    results = {}
+    for track_id in track_ids:
+        item = items.get(track_id)
+        if item is None:
+            results[track_id] = {"error": "Movie not found"}
+            continue
+
+        movie = _build_movie(item)
+        if movie is None:
+            results[track_id] = {"movie": None, "error": "Invalid movie data returned"}
+            continue
+
+        logger.debug("✅ Found movie: %s - £%s (%s)", movie["title"], movie["price"], movie["priceSource"])
 
+        results[track_id] = {"movie": movie, "error": None}
 
-def get_apple_pricing(item: Dict) -> Dict[str, Any]:
-    """Extract pricing information from Apple Store item."""
+    return results
+
+
+def _build_movie(item: Dict) -> Optional[Dict[str, Any]]:
+    """Build a movie dict from an iTunes result item, or None if the item has no title."""
+    title = item.get("trackName")
+    if not title:
+        return None
+
+    # Extract movie details
+    director = item.get("artistName", "Unknown Director")
+    year = extract_year_from_release_date(item.get("releaseDate", ""))
+    genre = item.get("primaryGenreName", "Unknown")
+
+    # Get pricing information
+    price_info = get_apple_pricing(item, year)
+
+    # Create Apple Store URL
+    apple_url = item.get(
+        "trackViewUrl",
+        f"https://tv.apple.com/search?term={quote(title)}",
+    )
+
+    # Create display name
+    display_name = f"{title} ({year})" if year else title
+
+    return {
+        "title": title,
+        "director": director,
+        "year": year,
+        "genre": genre,
+        "name": display_name,
+        "price": price_info["price"],
+        "url": apple_url,
+        "priceSource": price_info["source"],
+        "currency": price_info.get("currency", "GBP"),
+        "artwork": item.get("artworkUrl100", ""),
+        "description": item.get("shortDescription")
+        or (item.get("longDescription") or "")[:MOVIE_DESCRIPTION_MAX_LENGTH],
+        "trackId": item.get("trackId"),  # Store iTunes track ID for accurate price refresh
+    }
+
+
+def _movie_sort_key(movie: Dict[str, Any]) -> Tuple[bool, int, float]:
+    """Sort key for search results: standalone before collection/bundle, then price source, then price."""
+    url_l = movie["url"].lower()
+    desc_l = (movie["description"] or "").lower()
+    is_collection = "collection" in url_l or "bundle" in url_l or "collection" in desc_l or "bundle" in desc_l
+    return is_collection, get_price_priority(movie["priceSource"]), movie["price"] or 999
+
+
+def get_rate_limited_results(debug_info: Dict) -> Dict[str, Any]:
+    """Build the search response used when the iTunes rate limit has been hit."""
+    return {
+        "movies": [],
+        "total": 0,
+        "error": "Rate limited by Apple Store API (20 calls/minute limit)",
+        "rate_limited": True,
+        "debug": debug_info,
+    }
+
+
+def get_price_priority(price_source: str) -> int:
+    """Rank a price source: HD purchase first, then standard purchase, collection, rental, estimated."""
+    return _PRICE_PRIORITY.get(price_source, len(_PRICE_FIELDS))
+
+
+def get_apple_pricing(item: Dict, year: Optional[int] = None) -> Dict[str, Any]:
+    """Extract pricing information from Apple Store item. Pass year if already extracted from releaseDate."""
     # Get currency from the item (iTunes API returns this)
     currency = item.get("currency", "GBP")
 
     # Debug: Log the currency being used
-    print(f"💰 DEBUG: Movie '{item.get('trackName', 'Unknown')}' - Currency: {currency}")
+    logger.debug("💰 Movie '%s' - Currency: %s", item.get("trackName", "Unknown"), currency)
 
     # Prioritize purchase prices over rental prices
-    hd_purchase_price = item.get("trackHdPrice")
-    purchase_price = item.get("trackPrice")
-    collection_price = item.get("collectionPrice")
-    rental_price = item.get("trackRentalPrice")
-
-    # Priority order: HD purchase > standard purchase > collection > rental
-    if hd_purchase_price and hd_purchase_price > 0:
-        return {
-            "price": float(hd_purchase_price),
-            "source": "apple_hd_purchase",
-            "currency": currency,
-        }
-    elif purchase_price and purchase_price > 0:
-        return {
-            "price": float(purchase_price),
-            "source": "apple_purchase",
-            "currency": currency,
-        }
-    elif collection_price and collection_price > 0:
-        return {
-            "price": float(collection_price),
-            "source": "apple_collection",
-            "currency": currency,
-        }
-    elif rental_price and rental_price > 0:
-        return {
-            "price": float(rental_price),
-            "source": "apple_rental",
-            "currency": currency,
-        }
-    else:
-        # Generate estimated price based on movie characteristics
-        return {
-            "price": generate_estimated_movie_price(item),
-            "source": "estimated",
-            "currency": "GBP",  # Default to GBP for estimates
-        }
-
-
-def generate_estimated_movie_price(item: Dict) -> float:
-    """Generate estimated movie pricing."""
+    for field, source in _PRICE_FIELDS:
+        price = item.get(field)
+        if price and price > 0:
+            return {"price": float(price), "source": source, "currency": currency}
+
+    # Generate estimated price based on movie characteristics
+    return {
+        "price": generate_estimated_movie_price(item, year),
+        "source": "estimated",
+        "currency": "GBP",  # Default to GBP for estimates
+    }
+
+
+def generate_estimated_movie_price(item: Dict, year: Optional[int] = None) -> float:
+    """Generate estimated movie pricing. Pass year if already extracted from releaseDate."""
     # Base pricing for movies
     base_rental = 3.49
 
     # Adjust based on release date (newer movies cost more)
-    year = extract_year_from_release_date(item.get("releaseDate", ""))
+    if year is None:
+        year = extract_year_from_release_date(item.get("releaseDate", ""))
     current_year = 2025
 
     if year and year >= current_year - 1:  # Very recent
@@ -330,9 +489,7 @@ def generate_estimated_movie_price(item: Dict) -> float:
         base_rental = 3.99
 
     # Return rental price as it's more common
-    import random
-
-    variation = (random.random() - 0.5) * 1.0  # ±0.50
+    variation = stable_jitter(item.get("trackName", ""), 1.0)  # ±0.50
     return round(max(2.99, base_rental + variation), 2)
 
 
@@ -341,8 +498,12 @@ def extract_year_from_release_date(release_date: str) -> int:
     if not release_date:
         return None
 
-    # Try to extract 4-digit year
-    year_match = re.search(r"(\d{4})", release_date)
+    # iTunes dates are ISO 8601 ("2010-07-16T07:00:00Z"), so the year is usually up front
+    if release_date[:4].isdecimal():
+        return int(release_date[:4])
+
+    # Otherwise fall back to the first 4-digit run anywhere in the string
+    year_match = _YEAR_RE.search(release_date)
     if year_match:
         return int(year_match.group(1))
 
@@ -359,7 +520,7 @@ def get_mock_movie_results(query: str) -> Dict[str, Any]:
         "genre": "Drama",
         "name": f"{query} (2020)",
         "price": 7.99,
-        "url": f"https://tv.apple.com/search?term={requests.utils.quote(query)}",
+        "url": f"https://tv.apple.com/search?term={quote(query)}",
         "priceSource": "estimated",
         "artwork": "",
         "description": f'Movie information for "{query}" not available from Apple Store',
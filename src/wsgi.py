@@ -5,7 +5,7 @@ WSGI entry point for production deployment.
 from src.app import create_app
 from src.database.connection import init_database
 
-# Initialize database on startup
+# Initialize database on startup (only the first worker on a new schema does any work)
 init_database()
 
 # Create the application
@@ -2,20 +2,16 @@
 """
 Simple test runner - just run: devenv shell python test.py
 """
-import subprocess
 import sys
 
+from run_sqlalchemy_tests import run_sqlalchemy_tests
+
 def run_tests():
     """Run all SQLAlchemy tests."""
     print("🧪 Running all SQLAlchemy tests...\n")
-    
-    # Run the SQLAlchemy test runner
-    result = subprocess.run([
-        sys.executable, 
-        'run_sqlalchemy_tests.py'
-    ])
-    
-    return result.returncode
+
+    # Run the SQLAlchemy test suite in this interpreter
+    return run_sqlalchemy_tests()
 
 if __name__ == '__main__':
     exit_code = run_tests()
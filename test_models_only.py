@@ -3,6 +3,7 @@
 Simple test runner for SQLAlchemy models only (to debug database issues).
 """
 
+import importlib.util
 import pytest
 import sys
 import os
@@ -11,6 +12,9 @@ import os
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
+# Spread test files across CPU cores when pytest-xdist is installed
+PARALLEL_ARGS = ['-n', 'auto', '--dist=loadfile'] if importlib.util.find_spec('xdist') else []
+
 
 def run_model_tests():
     """Run only SQLAlchemy model tests."""
@@ -22,6 +26,7 @@ def run_model_tests():
         '-v',  # Verbose output
         '--tb=short',  # Short traceback format
         '--color=yes',  # Colored output
+        *PARALLEL_ARGS,
         'tests/test_sqlalchemy_models.py'
     ]
     
@@ -2,44 +2,133 @@
 Test configuration and fixtures for Price Tracker application.
 """
 
-import os
+import shutil
 import sqlite3
-import tempfile
+from contextlib import closing
 
 import pytest
 
 from src.app import create_app
+from src.models.database import Category, Item, db
+from src.services.book_search import clear_book_search_cache
+from src.services.movie_search import clear_movie_search_cache, itunes_rate_limiter
 
 # Import SQLAlchemy fixtures to make them available
-from tests.conftest_sqlalchemy import db_session, sqlalchemy_app, sqlalchemy_client
+from tests.conftest_sqlalchemy import (
+    TEST_PRAGMAS,
+    db_session,
+    rolled_back_session,
+    seed_ids,
+    sqlalchemy_app,
+    sqlalchemy_client,
+    sqlalchemy_file_app,
+    sqlalchemy_file_client,
+    sqlalchemy_session_app,
+    use_explicit_begin,
+    use_test_db_connections,
+    use_test_pragmas,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_search_caches():
+    """Stop cached API responses and rate limit state from leaking between tests."""
+    clear_book_search_cache()
+    clear_movie_search_cache()
+    itunes_rate_limiter.reset()
+    yield
+
+
+@pytest.fixture(scope="session")
+def template_db_path(tmp_path_factory):
+    """Build the legacy schema with init_database once, for tests to copy."""
+    import src.database.connection
+
+    db_path = str(tmp_path_factory.mktemp("template") / "template.db")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(src.database.connection, "DATABASE_PATH", db_path)
+        use_test_db_connections(mp)
+        src.database.connection.init_database()
+
+    return db_path
 
 
 @pytest.fixture
-def test_app():
-    """Create and configure a test Flask application."""
-    # Create a temporary database file
-    db_fd, db_path = tempfile.mkstemp()
+def memory_db(template_db_path):
+    """Open an in-memory copy of the initialized database, for tests that only use their own connection."""
+    conn = sqlite3.connect(":memory:")
+    with closing(sqlite3.connect(template_db_path)) as template:
+        template.backup(conn)
 
-    # Override the DATABASE_PATH in the database module
+    yield conn
+
+    conn.close()
+
+
+@pytest.fixture
+def fresh_db_path(template_db_path, tmp_path, monkeypatch):
+    """Give a test its own copy of the initialized database, used by the legacy sqlite3 connection."""
     import src.database.connection
 
-    original_path = src.database.connection.DATABASE_PATH
-    src.database.connection.DATABASE_PATH = db_path
+    db_path = str(tmp_path / "test.db")
+    shutil.copyfile(template_db_path, db_path)
+    monkeypatch.setattr(src.database.connection, "DATABASE_PATH", db_path)
+    use_test_db_connections(monkeypatch)
+    src.database.connection.invalidate_category_cache()
+
+    yield db_path
+
+    src.database.connection.invalidate_category_cache()
+
+
+@pytest.fixture(scope="session")
+def test_session_app(tmp_path_factory):
+    """
+    Create the test Flask application and its test data once for the whole test run.
+    The database is a file, shared by the SQLAlchemy models and the legacy sqlite3 routes.
+    """
+    import src.config
+
+    db_path = str(tmp_path_factory.mktemp("app") / "test.db")
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(src.config.Config, "DATABASE_PATH", db_path)
 
-    # Create the app
-    app = create_app()
-    app.config["TESTING"] = True
+        # Create the app, which creates the full schema
+        app = create_app()
+        app.config["TESTING"] = True
+
+    # Add the test data
+    init_test_database(db_path)
 
-    # Initialize the test database
     with app.app_context():
-        init_test_database(db_path)
+        use_explicit_begin(db.engine)
+        use_test_pragmas(db.engine)
+        # Drop connections opened before the listeners were added
+        db.engine.dispose()
 
-    yield app
+    yield app, db_path
 
-    # Clean up
-    src.database.connection.DATABASE_PATH = original_path
-    os.close(db_fd)
-    os.unlink(db_path)
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def test_app(test_session_app, monkeypatch):
+    """Provide the test Flask application with each test wrapped in a transaction that is rolled back."""
+    import src.config
+    import src.database.connection
+
+    app, db_path = test_session_app
+    monkeypatch.setattr(src.config.Config, "DATABASE_PATH", db_path)
+    monkeypatch.setattr(src.database.connection, "DATABASE_PATH", db_path)
+    use_test_db_connections(monkeypatch)
+    src.database.connection.invalidate_category_cache()
+
+    with rolled_back_session(app):
+        yield app
+
+    src.database.connection.invalidate_category_cache()
 
 
 @pytest.fixture
@@ -48,89 +137,116 @@ def client(test_app):
     return test_app.test_client()
 
 
+@pytest.fixture(scope="class")
+def readonly_client(test_session_app):
+    """
+    Create a test client shared by a whole test class.
+    Only for classes whose tests never write, since nothing is rolled back between them.
+    """
+    import src.config
+    import src.database.connection
+
+    app, db_path = test_session_app
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(src.config.Config, "DATABASE_PATH", db_path)
+        mp.setattr(src.database.connection, "DATABASE_PATH", db_path)
+
+        with app.test_client() as client:
+            yield client
+
+
 @pytest.fixture
 def runner(test_app):
     """Create a test runner for the Flask application."""
     return test_app.test_cli_runner()
 
 
+@pytest.fixture
+def ephemeral_category(test_app):
+    """Insert a general category through the ORM, skipping the HTTP API, and return its id."""
+    with test_app.app_context():
+        category = Category(name="Test Category", type="general", book_lookup_enabled=False, book_lookup_source="auto")
+        db.session.add(category)
+        db.session.commit()
+        return category.id
+
+
+@pytest.fixture
+def ephemeral_item(test_app):
+    """Insert an item into the Test Books category through the ORM, skipping the HTTP API, and return its id."""
+    with test_app.app_context():
+        item = Item(category_id=1, name="Original Item", url="https://example.com/original", price=10.99)
+        db.session.add(item)
+        db.session.commit()
+        return item.id
+
+
+_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS categories (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        type TEXT DEFAULT 'general',
+        book_lookup_enabled INTEGER DEFAULT 0,
+        book_lookup_source TEXT DEFAULT 'auto',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        category_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        title TEXT,
+        author TEXT,
+        url TEXT NOT NULL,
+        price REAL NOT NULL,
+        bought INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (category_id) REFERENCES categories (id) ON DELETE CASCADE
+    );
+"""
+
+_TEST_CATEGORIES = [
+    ("Test Books", "books", 1, "auto"),
+    ("Electronics", "general", 0, "auto"),
+]
+
+_TEST_ITEMS = [
+    (
+        1,
+        "The Great Gatsby by F. Scott Fitzgerald",
+        "The Great Gatsby",
+        "F. Scott Fitzgerald",
+        "https://example.com/gatsby",
+        12.99,
+        0,
+    ),
+    (2, "iPhone 15", None, None, "https://example.com/iphone", 999.99, 0),
+]
+
+
 def init_test_database(db_path):
-    """Initialize a test database with the required schema."""
+    """Create the legacy schema, unless the tables already exist, and add the test data."""
     conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    # Create categories table
-    cursor.execute(
-        """
-        CREATE TABLE categories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            type TEXT DEFAULT 'general',
-            book_lookup_enabled INTEGER DEFAULT 0,
-            book_lookup_source TEXT DEFAULT 'auto',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """
-    )
+    conn.executescript(TEST_PRAGMAS)
 
-    # Create items table
-    cursor.execute(
-        """
-        CREATE TABLE items (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            category_id INTEGER NOT NULL,
-            name TEXT NOT NULL,
-            title TEXT,
-            author TEXT,
-            url TEXT NOT NULL,
-            price REAL NOT NULL,
-            bought INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (category_id) REFERENCES categories (id) ON DELETE CASCADE
-        )
-    """
-    )
+    # Create tables
+    conn.executescript(_SCHEMA_SQL)
 
     # Insert test data
-    cursor.execute(
-        """
-        INSERT INTO categories (name, type, book_lookup_enabled, book_lookup_source)
-        VALUES (?, ?, ?, ?)
-    """,
-        ("Test Books", "books", 1, "auto"),
-    )
-
-    cursor.execute(
+    cursor = conn.cursor()
+    cursor.executemany(
         """
         INSERT INTO categories (name, type, book_lookup_enabled, book_lookup_source)
         VALUES (?, ?, ?, ?)
     """,
-        ("Electronics", "general", 0, "auto"),
+        _TEST_CATEGORIES,
     )
-
-    # Insert test items
-    cursor.execute(
+    cursor.executemany(
         """
         INSERT INTO items (category_id, name, title, author, url, price, bought)
         VALUES (?, ?, ?, ?, ?, ?, ?)
     """,
-        (
-            1,
-            "The Great Gatsby by F. Scott Fitzgerald",
-            "The Great Gatsby",
-            "F. Scott Fitzgerald",
-            "https://example.com/gatsby",
-            12.99,
-            0,
-        ),
-    )
-
-    cursor.execute(
-        """
-        INSERT INTO items (category_id, name, url, price, bought)
-        VALUES (?, ?, ?, ?, ?)
-    """,
-        (2, "iPhone 15", "https://example.com/iphone", 999.99, 0),
+        _TEST_ITEMS,
     )
 
     conn.commit()
@@ -3,74 +3,186 @@ SQLAlchemy test configuration and fixtures for Price Tracker application.
 """
 
 import os
-import tempfile
+from contextlib import contextmanager
 
 import pytest
+from flask.globals import app_ctx
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
-from src.app import create_app
+from src.database.connection import get_db_connection
 from src.models.database import Category, Item, PendingMovieSearch, PriceHistory, db
 
+# Test databases are thrown away, so skip the on-disk journal and the fsync on every commit
+TEST_PRAGMAS = "PRAGMA journal_mode=MEMORY; PRAGMA synchronous=OFF; PRAGMA temp_store=MEMORY;"
+
+
+def build_test_app(database_uri, engine_options=None, configure_engine=None):
+    """
+    Create a minimal Flask app with all blueprints, without calling create_app() to avoid migration.
+    configure_engine, if given, is called with the engine before the schema and test data are created.
+    """
+    from flask import Flask
+    from flask_cors import CORS
+
+    from src.app import OrjsonProvider
+    from src.routes.books import books_bp
+    from src.routes.categories import categories_bp
+    from src.routes.items import items_bp
+    from src.routes.main import main_bp
+    from src.routes.movies import movies_bp
+
+    # Get the path to the templates directory
+    template_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "templates"))
+    static_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "static"))
+
+    app = Flask(__name__, template_folder=template_dir, static_folder=static_dir)
+    app.config["TESTING"] = True
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_uri
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    if engine_options:
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options
+
+    # Match create_app's JSON serialization and CORS
+    app.json = OrjsonProvider(app)
+    CORS(app)
+
+    # Initialize SQLAlchemy with the app
+    db.init_app(app)
+
+    # Register blueprints
+    app.register_blueprint(main_bp)
+    app.register_blueprint(categories_bp)
+    app.register_blueprint(items_bp)
+    app.register_blueprint(books_bp)
+    app.register_blueprint(movies_bp)
+
+    with app.app_context():
+        if configure_engine:
+            configure_engine(db.engine)
+
+        # Create all tables
+        db.create_all()
+
+        # Add test data, keeping the seeded ids so tests can use them without looking rows up
+        app.config["SEED_IDS"] = create_test_data()
+
+    return app
+
+
+@pytest.fixture(scope="session")
+def sqlalchemy_session_app():
+    """Create the in-memory test application and its seed data once for the whole test run."""
+    # One shared connection keeps the in-memory database alive across sessions and threads.
+    # It is opened while seeding, so pysqlite's own BEGINs are turned off with connect_args.
+    app = build_test_app(
+        "sqlite:///:memory:",
+        {"poolclass": StaticPool, "connect_args": {"check_same_thread": False, "isolation_level": None}},
+    )
 
-@pytest.fixture
-def sqlalchemy_app():
-    """Create and configure a test Flask application with SQLAlchemy."""
-    # Create a temporary database file
-    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    with app.app_context():
+        use_explicit_begin(db.engine)
+
+    yield app
+
+    with app.app_context():
+        db.engine.dispose()
 
-    # Override the database path BEFORE creating the app
-    import src.config
 
-    original_path = src.config.Config.DATABASE_PATH
-    src.config.Config.DATABASE_PATH = db_path
+@contextmanager
+def rolled_back_session(app):
+    """
+    Run the body inside a transaction on one connection, and roll it back on exit.
+    db.session is bound to that connection, so commits made by tests or by routes only release a SAVEPOINT.
+    The app's engine must let SQLAlchemy issue BEGIN itself (see use_explicit_begin).
+    """
+    with app.app_context():
+        connection = db.engine.connect()
+        transaction = connection.begin()
+
+    original_session = db.session
+    db.session = scoped_session(
+        sessionmaker(bind=connection, join_transaction_mode="create_savepoint"),
+        scopefunc=lambda: id(app_ctx._get_current_object()),
+    )
 
     try:
-        # Create a minimal Flask app without calling create_app() to avoid migration
-        from flask import Flask
-        from flask_cors import CORS
-
-        from src.models.database import db
-        from src.routes.books import books_bp
-        from src.routes.categories import categories_bp
-        from src.routes.items import items_bp
-        from src.routes.main import main_bp
-        from src.routes.movies import movies_bp
-
-        # Get the path to the templates directory
-        template_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "templates"))
-        static_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "static"))
-
-        app = Flask(__name__, template_folder=template_dir, static_folder=static_dir)
-        app.config["TESTING"] = True
-        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
-        app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-
-        # Add CORS
-        CORS(app)
-
-        # Initialize SQLAlchemy with the app
-        db.init_app(app)
-
-        # Register blueprints
-        app.register_blueprint(main_bp)
-        app.register_blueprint(categories_bp)
-        app.register_blueprint(items_bp)
-        app.register_blueprint(books_bp)
-        app.register_blueprint(movies_bp)
+        yield
 
+    finally:
         with app.app_context():
-            # Create all tables
-            db.create_all()
+            db.session.remove()
+        db.session = original_session
+        transaction.rollback()
+        connection.close()
 
-            # Add test data
-            create_test_data()
 
-        yield app
+def use_explicit_begin(engine):
+    """
+    Stop pysqlite issuing its own BEGINs on new connections and emit BEGIN when SQLAlchemy starts a transaction.
+    This keeps SAVEPOINTs working as SQLAlchemy expects.
+    """
+    event.listen(engine, "connect", lambda dbapi_connection, record: setattr(dbapi_connection, "isolation_level", None))
+    event.listen(engine, "begin", lambda conn: conn.exec_driver_sql("BEGIN"))
 
-    finally:
-        # Clean up
-        src.config.Config.DATABASE_PATH = original_path
-        os.close(db_fd)
-        os.unlink(db_path)
+
+def use_test_pragmas(engine):
+    """Apply TEST_PRAGMAS to every connection the engine opens."""
+    event.listen(engine, "connect", lambda dbapi_connection, record: dbapi_connection.executescript(TEST_PRAGMAS))
+
+
+def get_test_db_connection():
+    """Open a legacy sqlite3 connection with TEST_PRAGMAS applied."""
+    conn = get_db_connection()
+    conn.executescript(TEST_PRAGMAS)
+    return conn
+
+
+def use_test_db_connections(mp):
+    """Make the legacy code open its sqlite3 connections with get_test_db_connection."""
+    import src.database.connection
+    import src.routes.movies
+
+    mp.setattr(src.database.connection, "get_db_connection", get_test_db_connection)
+    mp.setattr(src.routes.movies, "get_db_connection", get_test_db_connection)
+
+
+@pytest.fixture
+def sqlalchemy_app(sqlalchemy_session_app):
+    """Provide the shared test application with each test wrapped in a transaction that is rolled back."""
+    with rolled_back_session(sqlalchemy_session_app):
+        yield sqlalchemy_session_app
+
+
+@pytest.fixture
+def sqlalchemy_file_app(tmp_path, monkeypatch):
+    """
+    Create a test Flask application backed by a temporary database file.
+    The legacy sqlite3 routes are pointed at the same file, for tests that go through them.
+    """
+    import src.config
+    import src.database.connection
+
+    db_path = str(tmp_path / "test.db")
+    monkeypatch.setattr(src.config.Config, "DATABASE_PATH", db_path)
+    monkeypatch.setattr(src.database.connection, "DATABASE_PATH", db_path)
+    use_test_db_connections(monkeypatch)
+    src.database.connection.invalidate_category_cache()
+
+    app = build_test_app(f"sqlite:///{db_path}", configure_engine=use_test_pragmas)
+
+    yield app
+
+    with app.app_context():
+        db.engine.dispose()
+    src.database.connection.invalidate_category_cache()
+
+
+@pytest.fixture(scope="session")
+def seed_ids(sqlalchemy_session_app):
+    """Ids of the rows created by create_test_data, keyed by short names."""
+    return sqlalchemy_session_app.config["SEED_IDS"]
 
 
 @pytest.fixture
@@ -79,6 +191,12 @@ def sqlalchemy_client(sqlalchemy_app):
     return sqlalchemy_app.test_client()
 
 
+@pytest.fixture
+def sqlalchemy_file_client(sqlalchemy_file_app):
+    """Create a test client for the file-backed SQLAlchemy Flask application."""
+    return sqlalchemy_file_app.test_client()
+
+
 @pytest.fixture
 def db_session(sqlalchemy_app):
     """Create a database session for testing."""
@@ -87,7 +205,7 @@ def db_session(sqlalchemy_app):
 
 
 def create_test_data():
-    """Create test data for SQLAlchemy tests."""
+    """Create test data for SQLAlchemy tests, and return the ids of the categories and items."""
     # Create test categories
     books_category = Category(
         name="Test Books",
@@ -111,7 +229,7 @@ def create_test_data():
     )
 
     db.session.add_all([books_category, movies_category, general_category])
-    db.session.commit()
+    db.session.flush()
 
     # Create test items
     book_item = Item(
@@ -145,7 +263,7 @@ def create_test_data():
     )
 
     db.session.add_all([book_item, movie_item, electronics_item])
-    db.session.commit()
+    db.session.flush()
 
     # Create test price history
     price_change = PriceHistory(
@@ -159,6 +277,15 @@ def create_test_data():
     db.session.add(price_change)
     db.session.commit()
 
+    return {
+        "books_category": books_category.id,
+        "movies_category": movies_category.id,
+        "general_category": general_category.id,
+        "gatsby": book_item.id,
+        "inception": movie_item.id,
+        "iphone": electronics_item.id,
+    }
+
 
 @pytest.fixture
 def sample_category():
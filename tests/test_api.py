@@ -2,9 +2,19 @@
 Test suite for API endpoints.
 """
 
-import json
+from operator import itemgetter
 
-import pytest
+import orjson
+
+from src.models.database import Item, db
+
+# Fields every serialized category and book search result must have
+_CATEGORY_FIELDS = frozenset({"id", "name", "type", "bookLookupEnabled", "items"})
+_BOOK_FIELDS = frozenset({"title", "author", "price", "url", "priceSource"})
+
+# Fields compared between a request payload and the serialized category/item that comes back
+_category_fields = itemgetter("name", "type", "bookLookupEnabled")
+_item_fields = itemgetter("name", "title", "author", "price")
 
 
 class TestCategoriesAPI:
@@ -15,17 +25,13 @@ class TestCategoriesAPI:
         response = client.get("/api/categories")
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         assert isinstance(data, list)
         assert len(data) >= 2  # We have test data
 
         # Check category structure
         category = data[0]
-        assert "id" in category
-        assert "name" in category
-        assert "type" in category
-        assert "bookLookupEnabled" in category
-        assert "items" in category
+        assert _CATEGORY_FIELDS <= category.keys()
 
     def test_create_category(self, client, sample_category_data):
         """Test creating a new category."""
@@ -36,36 +42,21 @@ class TestCategoriesAPI:
         )
         assert response.status_code == 201
 
-        data = json.loads(response.data)
-        assert data["name"] == sample_category_data["name"]
-        assert data["type"] == sample_category_data["type"]
-        assert data["bookLookupEnabled"] == sample_category_data["bookLookupEnabled"]
+        data = orjson.loads(response.data)
+        assert _category_fields(data) == _category_fields(sample_category_data)
 
     def test_create_category_missing_name(self, client):
         """Test creating a category without a name."""
         response = client.post("/api/categories", json={}, content_type="application/json")
         assert response.status_code == 400
 
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         assert "error" in data
 
-    def test_update_category(self, client):
+    def test_update_category(self, client, ephemeral_category):
         """Test updating an existing category."""
-        # First create a category
-        create_data = {
-            "name": "Test Category",
-            "type": "general",
-            "bookLookupEnabled": False,
-            "bookLookupSource": "auto",
-        }
-
-        create_response = client.post("/api/categories", json=create_data, content_type="application/json")
-        assert create_response.status_code == 201
-
-        created_category = json.loads(create_response.data)
-        category_id = created_category["id"]
+        category_id = ephemeral_category
 
-        # Now update it
         update_data = {
             "name": "Updated Category",
             "type": "books",
@@ -80,10 +71,8 @@ class TestCategoriesAPI:
         )
         assert update_response.status_code == 200
 
-        updated_category = json.loads(update_response.data)
-        assert updated_category["name"] == update_data["name"]
-        assert updated_category["type"] == update_data["type"]
-        assert updated_category["bookLookupEnabled"] == update_data["bookLookupEnabled"]
+        updated_category = orjson.loads(update_response.data)
+        assert _category_fields(updated_category) == _category_fields(update_data)
 
     def test_update_nonexistent_category(self, client):
         """Test updating a category that doesn't exist."""
@@ -97,29 +86,16 @@ class TestCategoriesAPI:
         response = client.put("/api/categories/999", json=update_data, content_type="application/json")
         assert response.status_code == 404
 
-    def test_delete_category(self, client):
+    def test_delete_category(self, client, ephemeral_category):
         """Test deleting a category."""
-        # First create a category
-        create_data = {
-            "name": "Category to Delete",
-            "type": "general",
-            "bookLookupEnabled": False,
-            "bookLookupSource": "auto",
-        }
-
-        create_response = client.post("/api/categories", json=create_data, content_type="application/json")
-        assert create_response.status_code == 201
+        category_id = ephemeral_category
 
-        created_category = json.loads(create_response.data)
-        category_id = created_category["id"]
-
-        # Now delete it
         delete_response = client.delete(f"/api/categories/{category_id}")
         assert delete_response.status_code == 200
 
         # Verify it's deleted
         get_response = client.get("/api/categories")
-        categories = json.loads(get_response.data)
+        categories = orjson.loads(get_response.data)
         category_ids = [cat["id"] for cat in categories]
         assert category_id not in category_ids
 
@@ -142,11 +118,8 @@ class TestItemsAPI:
         )
         assert response.status_code == 201
 
-        data = json.loads(response.data)
-        assert data["name"] == sample_item_data["name"]
-        assert data["title"] == sample_item_data["title"]
-        assert data["author"] == sample_item_data["author"]
-        assert data["price"] == sample_item_data["price"]
+        data = orjson.loads(response.data)
+        assert _item_fields(data) == _item_fields(sample_item_data)
         assert data["categoryId"] == 1
 
     def test_create_item_missing_fields(self, client):
@@ -163,7 +136,7 @@ class TestItemsAPI:
         )
         assert response.status_code == 400
 
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         assert "error" in data
 
     def test_create_item_nonexistent_category(self, client, sample_item_data):
@@ -175,22 +148,10 @@ class TestItemsAPI:
         )
         assert response.status_code == 404
 
-    def test_update_item(self, client):
+    def test_update_item(self, client, ephemeral_item):
         """Test updating an existing item."""
-        # Create an item first
-        create_data = {
-            "name": "Original Item",
-            "url": "https://example.com/original",
-            "price": 10.99,
-        }
-
-        create_response = client.post("/api/categories/1/items", json=create_data, content_type="application/json")
-        assert create_response.status_code == 201
+        item_id = ephemeral_item
 
-        created_item = json.loads(create_response.data)
-        item_id = created_item["id"]
-
-        # Update the item
         update_data = {
             "name": "Updated Item",
             "title": "Updated Title",
@@ -202,11 +163,8 @@ class TestItemsAPI:
         update_response = client.put(f"/api/items/{item_id}", json=update_data, content_type="application/json")
         assert update_response.status_code == 200
 
-        updated_item = json.loads(update_response.data)
-        assert updated_item["name"] == update_data["name"]
-        assert updated_item["title"] == update_data["title"]
-        assert updated_item["author"] == update_data["author"]
-        assert updated_item["price"] == update_data["price"]
+        updated_item = orjson.loads(update_response.data)
+        assert _item_fields(updated_item) == _item_fields(update_data)
 
     def test_update_nonexistent_item(self, client):
         """Test updating an item that doesn't exist."""
@@ -221,20 +179,23 @@ class TestItemsAPI:
 
     def test_toggle_item_bought(self, client):
         """Test toggling an item's bought status."""
-        # Use existing test item (id=1)
+        # Use existing test item (id=1), which starts unbought
         response = client.patch("/api/items/1/bought")
         assert response.status_code == 200
 
-        data = json.loads(response.data)
-        # Item should now be bought (was False initially)
+        data = orjson.loads(response.data)
         assert data["bought"]
 
-        # Toggle again
+    def test_toggle_item_bought_true_to_false(self, client, test_app):
+        """Test toggling a bought item back to unbought."""
+        with test_app.app_context():
+            db.session.get(Item, 1).bought = True
+            db.session.commit()
+
         response = client.patch("/api/items/1/bought")
         assert response.status_code == 200
 
-        data = json.loads(response.data)
-        # Item should now be unbought
+        data = orjson.loads(response.data)
         assert data["bought"] is False
 
     def test_toggle_nonexistent_item_bought(self, client):
@@ -242,28 +203,16 @@ class TestItemsAPI:
         response = client.patch("/api/items/999/bought")
         assert response.status_code == 404
 
-    def test_delete_item(self, client):
+    def test_delete_item(self, client, ephemeral_item):
         """Test deleting an item."""
-        # Create an item first
-        create_data = {
-            "name": "Item to Delete",
-            "url": "https://example.com/delete",
-            "price": 5.99,
-        }
-
-        create_response = client.post("/api/categories/1/items", json=create_data, content_type="application/json")
-        assert create_response.status_code == 201
-
-        created_item = json.loads(create_response.data)
-        item_id = created_item["id"]
+        item_id = ephemeral_item
 
-        # Delete the item
         delete_response = client.delete(f"/api/items/{item_id}")
         assert delete_response.status_code == 200
 
         # Verify it's deleted by checking categories
         get_response = client.get("/api/categories")
-        categories = json.loads(get_response.data)
+        categories = orjson.loads(get_response.data)
 
         # Find the category and check its items
         test_category = next(cat for cat in categories if cat["id"] == 1)
@@ -279,51 +228,46 @@ class TestItemsAPI:
 class TestBookSearchAPI:
     """Test book search API endpoints."""
 
-    def test_search_books_success(self, client):
+    def test_search_books_success(self, readonly_client):
         """Test successful book search."""
-        response = client.get("/api/books/search?query=python")
+        response = readonly_client.get("/api/books/search?query=python")
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         assert "books" in data
         assert isinstance(data["books"], list)
 
         if len(data["books"]) > 0:
             book = data["books"][0]
-            assert "title" in book
-            assert "author" in book
-            assert "price" in book
-            assert "url" in book
-            assert "priceSource" in book
+            assert _BOOK_FIELDS <= book.keys()
 
-    def test_search_books_missing_query(self, client):
+    def test_search_books_missing_query(self, readonly_client):
         """Test book search without query parameter."""
-        response = client.get("/api/books/search")
+        response = readonly_client.get("/api/books/search")
         assert response.status_code == 400
 
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         assert "error" in data
 
-    def test_search_books_with_source(self, client):
+    def test_search_books_with_source(self, readonly_client):
         """Test book search with specific source."""
-        response = client.get("/api/books/search?query=python&source=google_books")
+        response = readonly_client.get("/api/books/search?query=python&source=google_books")
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         assert "books" in data
 
 
 class TestDatabaseConfigAPI:
     """Test database configuration API."""
 
-    def test_get_database_config(self, client):
+    def test_get_database_config(self, readonly_client):
         """Test getting database configuration."""
-        response = client.get("/api/database/config")
+        response = readonly_client.get("/api/database/config")
         assert response.status_code == 200
 
-        data = json.loads(response.data)
-        assert "type" in data
-        assert "available" in data
+        data = orjson.loads(response.data)
+        assert {"type", "available"} <= data.keys()
         assert data["type"] == "sqlite"
         assert isinstance(data["available"], list)
 
@@ -331,9 +275,9 @@ class TestDatabaseConfigAPI:
 class TestMainRoutes:
     """Test main application routes."""
 
-    def test_index_route(self, client):
+    def test_index_route(self, readonly_client):
         """Test the main index route."""
-        response = client.get("/")
+        response = readonly_client.get("/")
         assert response.status_code == 200
         assert b"PriceNest" in response.data
         assert b"<html" in response.data
@@ -2,82 +2,85 @@
 Tests for book search endpoints.
 """
 
-import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 
+# Search results returned by the mocked book services. The route only serializes them, so tests share them as-is.
+_GOOGLE_RESULTS = {
+    "books": [
+        {
+            "title": "Test Book",
+            "authors": ["Test Author"],
+            "price": 9.99,
+            "thumbnail": "https://example.com/thumb.jpg",
+            "isbn": "1234567890",
+            "id": "book123",
+        }
+    ],
+    "total": 1,
+    "source": "google_books",
+}
+
+_KOBO_RESULTS = {
+    "books": [{"title": "Kobo Book", "authors": ["Kobo Author"], "price": 12.99}],
+    "total": 1,
+    "source": "kobo",
+}
+
+
+@pytest.fixture
+def books_client(sqlalchemy_session_app):
+    """Client on the shared test app with no per-test transaction, since book search never touches the database."""
+    return sqlalchemy_session_app.test_client()
+
 
 class TestBooksEndpoints:
     """Test book search endpoints."""
 
-    @patch("src.routes.books.search_google_books")
-    def test_search_books_success(self, mock_search, sqlalchemy_app, sqlalchemy_client):
+    def test_search_books_success(self, books_client, monkeypatch):
         """Test successful book search."""
-        with sqlalchemy_app.app_context():
-            # Mock the search response
-            mock_search.return_value = {
-                "books": [
-                    {
-                        "title": "Test Book",
-                        "authors": ["Test Author"],
-                        "price": 9.99,
-                        "thumbnail": "https://example.com/thumb.jpg",
-                        "isbn": "1234567890",
-                        "id": "book123",
-                    }
-                ],
-                "total": 1,
-                "source": "google_books",
-            }
-
-            response = sqlalchemy_client.get("/api/books/search?query=test")
-
-            assert response.status_code == 200
-            data = json.loads(response.data)
-            assert "books" in data
-            assert len(data["books"]) == 1
-            assert data["books"][0]["title"] == "Test Book"
-            assert data["total"] == 1
-            assert data["source"] == "google_books"
-
-    def test_search_books_missing_query(self, sqlalchemy_app, sqlalchemy_client):
+        # Mock the search response
+        monkeypatch.setattr("src.routes.books.search_google_books", MagicMock(return_value=_GOOGLE_RESULTS))
+
+        response = books_client.get("/api/books/search?query=test")
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert "books" in data
+        assert len(data["books"]) == 1
+        assert data["books"][0]["title"] == "Test Book"
+        assert data["total"] == 1
+        assert data["source"] == "google_books"
+
+    def test_search_books_missing_query(self, books_client):
         """Test book search without query parameter."""
-        with sqlalchemy_app.app_context():
-            response = sqlalchemy_client.get("/api/books/search")
+        response = books_client.get("/api/books/search")
 
-            assert response.status_code == 400
-            data = json.loads(response.data)
-            assert "error" in data
-            assert "Search query is required" in data["error"]
+        assert response.status_code == 400
+        data = response.get_json()
+        assert "error" in data
+        assert "Search query is required" in data["error"]
 
-    @patch("src.routes.books.search_kobo_books")
-    def test_search_books_with_kobo_source(self, mock_search, sqlalchemy_app, sqlalchemy_client):
+    def test_search_books_with_kobo_source(self, books_client, monkeypatch):
         """Test book search with Kobo source."""
-        with sqlalchemy_app.app_context():
-            mock_search.return_value = {
-                "books": [{"title": "Kobo Book", "authors": ["Kobo Author"], "price": 12.99}],
-                "total": 1,
-                "source": "kobo",
-            }
-
-            response = sqlalchemy_client.get("/api/books/search?q=test&source=kobo")
-
-            assert response.status_code == 200
-            data = json.loads(response.data)
-            assert data["books"][0]["title"] == "Kobo Book"
-            assert data["source"] == "kobo"
-
-    @patch("src.routes.books.search_google_books")
-    def test_search_books_with_exception(self, mock_search, sqlalchemy_app, sqlalchemy_client):
+        monkeypatch.setattr("src.routes.books.search_kobo_books", MagicMock(return_value=_KOBO_RESULTS))
+
+        response = books_client.get("/api/books/search?q=test&source=kobo")
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["books"][0]["title"] == "Kobo Book"
+        assert data["source"] == "kobo"
+
+    def test_search_books_with_exception(self, books_client, monkeypatch):
         """Test book search error handling."""
-        with sqlalchemy_app.app_context():
-            # Mock an exception
-            mock_search.side_effect = Exception("API Error")
+        # Mock an exception
+        monkeypatch.setattr("src.routes.books.search_google_books", MagicMock(side_effect=Exception("API Error")))
 
-            response = sqlalchemy_client.get("/api/books/search?query=test")
+        response = books_client.get("/api/books/search?query=test")
 
-            assert response.status_code == 500
-            data = json.loads(response.data)
-            assert "error" in data
-            assert "Failed to search books" in data["error"]
+        assert response.status_code == 500
+        data = response.get_json()
+        assert "error" in data
+        assert "Failed to search books" in data["error"]
@@ -2,99 +2,92 @@
 Tests for database operations and data integrity.
 """
 
-import os
 import sqlite3
-import tempfile
 
 import pytest
 
-from src.database.connection import format_category, get_db_connection, init_database
+from src.database.connection import (
+    format_category,
+    get_category,
+    get_db_connection,
+    init_database,
+    invalidate_category_cache,
+)
 
 
 class TestDatabaseOperations:
     """Test database operations and data integrity."""
 
-    def test_database_initialization(self):
+    def test_database_initialization(self, memory_db):
         """Test that the database is properly initialized."""
-        # Create a temporary database
-        db_fd, db_path = tempfile.mkstemp()
-
-        try:
-            # Override the DATABASE_PATH
-            import src.database.connection
-
-            original_path = src.database.connection.DATABASE_PATH
-            src.database.connection.DATABASE_PATH = db_path
-
-            # Initialize the database
-            init_database()
-
-            # Check that tables were created
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-
-            # Check categories table
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='categories'")
-            assert cursor.fetchone() is not None
-
-            # Check items table
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='items'")
-            assert cursor.fetchone() is not None
-
-            # Check categories table schema
-            cursor.execute("PRAGMA table_info(categories)")
-            columns = [column[1] for column in cursor.fetchall()]
-            expected_columns = [
-                "id",
-                "name",
-                "type",
-                "book_lookup_enabled",
-                "book_lookup_source",
-                "created_at",
-            ]
-            for col in expected_columns:
-                assert col in columns
-
-            # Check items table schema
-            cursor.execute("PRAGMA table_info(items)")
-            columns = [column[1] for column in cursor.fetchall()]
-            expected_columns = [
-                "id",
-                "category_id",
-                "name",
-                "title",
-                "author",
-                "url",
-                "price",
-                "bought",
-                "created_at",
-            ]
-            for col in expected_columns:
-                assert col in columns
-
-            conn.close()
-
-        finally:
-            # Restore original path
-            src.database.connection.DATABASE_PATH = original_path
-            os.close(db_fd)
-            os.unlink(db_path)
+        # Check that tables were created
+        conn = memory_db
+        cursor = conn.cursor()
+
+        # Check categories table
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='categories'")
+        assert cursor.fetchone() is not None
+
+        # Check items table
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='items'")
+        assert cursor.fetchone() is not None
+
+        # Check categories table schema
+        cursor.execute("PRAGMA table_info(categories)")
+        columns = [column[1] for column in cursor.fetchall()]
+        expected_columns = [
+            "id",
+            "name",
+            "type",
+            "book_lookup_enabled",
+            "book_lookup_source",
+            "created_at",
+        ]
+        for col in expected_columns:
+            assert col in columns
+
+        # Check items table schema
+        cursor.execute("PRAGMA table_info(items)")
+        columns = [column[1] for column in cursor.fetchall()]
+        expected_columns = [
+            "id",
+            "category_id",
+            "name",
+            "title",
+            "author",
+            "url",
+            "price",
+            "bought",
+            "created_at",
+        ]
+        for col in expected_columns:
+            assert col in columns
+
+        conn.close()
+
+    def test_database_initialization_runs_once(self, tmp_path, monkeypatch):
+        """Test that re-initializing a current database leaves its data alone."""
+        import src.database.connection
+
+        db_path = str(tmp_path / "test.db")
+        monkeypatch.setattr(src.database.connection, "DATABASE_PATH", db_path)
+
+        init_database()
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("INSERT INTO price_history (item_id, old_price, new_price) VALUES (1, 9.99, 7.99)")
+        conn.commit()
+
+        init_database()
+
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == src.database.connection.SCHEMA_VERSION
+        assert conn.execute("SELECT COUNT(*) FROM price_history").fetchone()[0] == 1
+        conn.close()
 
     def test_format_category_with_type(self):
         """Test formatting category with type field."""
-
-        # Mock SQLite Row with type
-        class MockRow:
-            def __init__(self, data):
-                self.data = data
-
-            def __getitem__(self, key):
-                return self.data[key]
-
-            def keys(self):
-                return self.data.keys()
-
-        row_data = {
+        # A dict has the keys() and item access that format_category uses on sqlite3.Row
+        row = {
             "id": 1,
             "name": "Test Books",
             "type": "books",
@@ -102,7 +95,6 @@ class TestDatabaseOperations:
             "book_lookup_source": "auto",
         }
 
-        row = MockRow(row_data)
         category = format_category(row)
 
         assert category["id"] == 1
@@ -114,28 +106,14 @@ class TestDatabaseOperations:
 
     def test_format_category_without_type(self):
         """Test formatting category without type field (backward compatibility)."""
-
-        class MockRow:
-            def __init__(self, data):
-                self.data = data
-
-            def __getitem__(self, key):
-                if key not in self.data:
-                    raise KeyError(key)
-                return self.data[key]
-
-            def keys(self):
-                return self.data.keys()
-
         # Old format without type field
-        row_data = {
+        row = {
             "id": 1,
             "name": "Electronics",
             "book_lookup_enabled": 0,
             "book_lookup_source": "auto",
         }
 
-        row = MockRow(row_data)
         category = format_category(row)
 
         assert category["id"] == 1
@@ -144,202 +122,142 @@ class TestDatabaseOperations:
         assert category["bookLookupEnabled"] is False
         assert category["bookLookupSource"] == "auto"
 
-    def test_database_foreign_key_constraint(self):
+    def test_database_foreign_key_constraint(self, memory_db):
         """Test that foreign key constraints work properly."""
-        # Create a temporary database
-        db_fd, db_path = tempfile.mkstemp()
-
-        try:
-            # Override the DATABASE_PATH
-            import src.database.connection
-
-            original_path = src.database.connection.DATABASE_PATH
-            src.database.connection.DATABASE_PATH = db_path
-
-            init_database()
-
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-
-            # Enable foreign key constraints
-            cursor.execute("PRAGMA foreign_keys = ON")
-
-            # Insert a category
-            cursor.execute(
-                """
-                INSERT INTO categories (name, type, book_lookup_enabled, book_lookup_source)
-                VALUES (?, ?, ?, ?)
-            """,
-                ("Test Category", "general", 0, "auto"),
-            )
-
-            category_id = cursor.lastrowid
-
-            # Insert an item
-            cursor.execute(
-                """
-                INSERT INTO items (category_id, name, url, price, bought)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (category_id, "Test Item", "https://example.com", 10.99, 0),
-            )
-
-            # Verify item was inserted
-            cursor.execute("SELECT COUNT(*) FROM items WHERE category_id = ?", (category_id,))
-            assert cursor.fetchone()[0] == 1
-
-            # Delete the category (should cascade delete the item)
-            cursor.execute("DELETE FROM categories WHERE id = ?", (category_id,))
-
-            # Verify item was deleted due to foreign key constraint
-            cursor.execute("SELECT COUNT(*) FROM items WHERE category_id = ?", (category_id,))
-            assert cursor.fetchone()[0] == 0
-
-            conn.commit()
-            conn.close()
-
-        finally:
-            src.app.DATABASE_PATH = original_path
-            os.close(db_fd)
-            os.unlink(db_path)
-
-    def test_database_connection(self):
+        conn = memory_db
+        cursor = conn.cursor()
+
+        # Enable foreign key constraints
+        cursor.execute("PRAGMA foreign_keys = ON")
+
+        # Insert a category
+        cursor.execute(
+            """
+            INSERT INTO categories (name, type, book_lookup_enabled, book_lookup_source)
+            VALUES (?, ?, ?, ?)
+        """,
+            ("Test Category", "general", 0, "auto"),
+        )
+
+        category_id = cursor.lastrowid
+
+        # Insert an item
+        cursor.execute(
+            """
+            INSERT INTO items (category_id, name, url, price, bought)
+            VALUES (?, ?, ?, ?, ?)
+        """,
+            (category_id, "Test Item", "https://example.com", 10.99, 0),
+        )
+
+        # Verify item was inserted
+        cursor.execute("SELECT COUNT(*) FROM items WHERE category_id = ?", (category_id,))
+        assert cursor.fetchone()[0] == 1
+
+        # Delete the category (should cascade delete the item)
+        cursor.execute("DELETE FROM categories WHERE id = ?", (category_id,))
+
+        # Verify item was deleted due to foreign key constraint
+        cursor.execute("SELECT COUNT(*) FROM items WHERE category_id = ?", (category_id,))
+        assert cursor.fetchone()[0] == 0
+
+        conn.commit()
+        conn.close()
+
+    def test_database_connection(self, fresh_db_path):
         """Test database connection functionality."""
-        # Create a temporary database
-        db_fd, db_path = tempfile.mkstemp()
-
-        try:
-            # Override the DATABASE_PATH
-            import src.database.connection
-
-            original_path = src.database.connection.DATABASE_PATH
-            src.database.connection.DATABASE_PATH = db_path
+        # Test connection
+        conn = get_db_connection()
+        assert conn is not None
 
-            # Test connection
-            conn = get_db_connection()
-            assert conn is not None
+        # Test row factory
+        assert conn.row_factory == sqlite3.Row
 
-            # Test row factory
-            assert conn.row_factory == sqlite3.Row
+        # Test basic query
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 as test")
+        row = cursor.fetchone()
+        assert row["test"] == 1
 
-            # Test basic query
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1 as test")
-            row = cursor.fetchone()
-            assert row["test"] == 1
+        conn.close()
 
-            conn.close()
-
-        finally:
-            src.app.DATABASE_PATH = original_path
-            os.close(db_fd)
-            os.unlink(db_path)
-
-    def test_data_types_and_constraints(self):
+    def test_data_types_and_constraints(self, memory_db):
         """Test that data types and constraints are properly enforced."""
-        # Create a temporary database
-        db_fd, db_path = tempfile.mkstemp()
-
-        try:
-            # Override the DATABASE_PATH
-            import src.database.connection
-
-            original_path = src.database.connection.DATABASE_PATH
-            src.database.connection.DATABASE_PATH = db_path
-
-            init_database()
-
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-
-            # Test category constraints
-            # Name is required (NOT NULL)
-            with pytest.raises(sqlite3.IntegrityError):
-                cursor.execute(
-                    """
-                    INSERT INTO categories (type, book_lookup_enabled, book_lookup_source)
-                    VALUES (?, ?, ?)
-                """,
-                    ("general", 0, "auto"),
-                )
-
-            # Test item constraints
-            # First insert a valid category
+        conn = memory_db
+        cursor = conn.cursor()
+
+        # Test category constraints
+        # Name is required (NOT NULL)
+        with pytest.raises(sqlite3.IntegrityError):
             cursor.execute(
                 """
-                INSERT INTO categories (name, type, book_lookup_enabled, book_lookup_source)
-                VALUES (?, ?, ?, ?)
+                INSERT INTO categories (type, book_lookup_enabled, book_lookup_source)
+                VALUES (?, ?, ?)
             """,
-                ("Test Category", "general", 0, "auto"),
+                ("general", 0, "auto"),
             )
 
-            category_id = cursor.lastrowid
+        # Test item constraints
+        # First insert a valid category
+        cursor.execute(
+            """
+            INSERT INTO categories (name, type, book_lookup_enabled, book_lookup_source)
+            VALUES (?, ?, ?, ?)
+        """,
+            ("Test Category", "general", 0, "auto"),
+        )
 
-            # Test that required fields are enforced
-            with pytest.raises(sqlite3.IntegrityError):
-                cursor.execute(
-                    """
-                    INSERT INTO items (category_id, url, price, bought)
-                    VALUES (?, ?, ?, ?)
-                """,
-                    (category_id, "https://example.com", 10.99, 0),
-                )
-                # Missing name field
+        category_id = cursor.lastrowid
 
-            # Test valid item insertion
+        # Test that required fields are enforced
+        with pytest.raises(sqlite3.IntegrityError):
             cursor.execute(
                 """
-                INSERT INTO items (category_id, name, url, price, bought)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT INTO items (category_id, url, price, bought)
+                VALUES (?, ?, ?, ?)
             """,
-                (category_id, "Valid Item", "https://example.com", 10.99, 0),
+                (category_id, "https://example.com", 10.99, 0),
             )
+            # Missing name field
 
-            # Verify insertion
-            cursor.execute("SELECT COUNT(*) FROM items")
-            assert cursor.fetchone()[0] == 1
+        # Test valid item insertion
+        cursor.execute(
+            """
+            INSERT INTO items (category_id, name, url, price, bought)
+            VALUES (?, ?, ?, ?, ?)
+        """,
+            (category_id, "Valid Item", "https://example.com", 10.99, 0),
+        )
 
-            conn.close()
+        # Verify insertion
+        cursor.execute("SELECT COUNT(*) FROM items")
+        assert cursor.fetchone()[0] == 1
 
-        finally:
-            src.app.DATABASE_PATH = original_path
-            os.close(db_fd)
-            os.unlink(db_path)
+        conn.close()
 
-    def test_book_category_data_handling(self):
+    def test_book_category_data_handling(self, memory_db):
         """Test handling of book-specific data (title, author)."""
-        # Create a temporary database
-        db_fd, db_path = tempfile.mkstemp()
-
-        try:
-            # Override the DATABASE_PATH
-            import src.database.connection
-
-            original_path = src.database.connection.DATABASE_PATH
-            src.database.connection.DATABASE_PATH = db_path
-
-            init_database()
-
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-
-            # Insert a book category
-            cursor.execute(
-                """
-                INSERT INTO categories (name, type, book_lookup_enabled, book_lookup_source)
-                VALUES (?, ?, ?, ?)
-            """,
-                ("Books", "books", 1, "auto"),
-            )
-
-            category_id = cursor.lastrowid
-
-            # Insert a book item with title and author
-            cursor.execute(
-                """
-                INSERT INTO items (category_id, name, title, author, url, price, bought)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
+        conn = memory_db
+        cursor = conn.cursor()
+
+        # Insert a book category
+        cursor.execute(
+            """
+            INSERT INTO categories (name, type, book_lookup_enabled, book_lookup_source)
+            VALUES (?, ?, ?, ?)
+        """,
+            ("Books", "books", 1, "auto"),
+        )
+
+        category_id = cursor.lastrowid
+
+        # Insert a book item with title and author, and a general item without them
+        cursor.executemany(
+            """
+            INSERT INTO items (category_id, name, title, author, url, price, bought)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+            [
                 (
                     category_id,
                     "Dune by Frank Herbert",
@@ -349,46 +267,63 @@ class TestDatabaseOperations:
                     14.99,
                     0,
                 ),
-            )
-
-            # Retrieve and verify the data
-            cursor.execute(
-                """
-                SELECT name, title, author FROM items WHERE category_id = ?
-            """,
-                (category_id,),
-            )
-
-            row = cursor.fetchone()
-            assert row[0] == "Dune by Frank Herbert"  # name
-            assert row[1] == "Dune"  # title
-            assert row[2] == "Frank Herbert"  # author
-
-            # Test item without title/author (general item in book category)
-            cursor.execute(
-                """
-                INSERT INTO items (category_id, name, url, price, bought)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (category_id, "Book Light", "https://example.com/light", 9.99, 0),
-            )
-
-            # Verify it was inserted correctly
-            cursor.execute(
-                """
-                SELECT name, title, author FROM items WHERE name = ?
-            """,
-                ("Book Light",),
-            )
-
-            row = cursor.fetchone()
-            assert row[0] == "Book Light"
-            assert row[1] is None  # title should be NULL
-            assert row[2] is None  # author should be NULL
-
-            conn.close()
-
-        finally:
-            src.app.DATABASE_PATH = original_path
-            os.close(db_fd)
-            os.unlink(db_path)
+                (category_id, "Book Light", None, None, "https://example.com/light", 9.99, 0),
+            ],
+        )
+
+        # Retrieve and verify the data
+        cursor.execute(
+            """
+            SELECT name, title, author FROM items WHERE name = ?
+        """,
+            ("Dune by Frank Herbert",),
+        )
+
+        row = cursor.fetchone()
+        assert row[0] == "Dune by Frank Herbert"  # name
+        assert row[1] == "Dune"  # title
+        assert row[2] == "Frank Herbert"  # author
+
+        # Test item without title/author (general item in book category)
+        # Verify it was inserted correctly
+        cursor.execute(
+            """
+            SELECT name, title, author FROM items WHERE name = ?
+        """,
+            ("Book Light",),
+        )
+
+        row = cursor.fetchone()
+        assert row[0] == "Book Light"
+        assert row[1] is None  # title should be NULL
+        assert row[2] is None  # author should be NULL
+
+        conn.close()
+
+    def test_get_category_caches_rows(self, fresh_db_path):
+        """Test that category lookups are served from the cache until invalidated."""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT INTO categories (name, type, book_lookup_enabled, book_lookup_source)
+            VALUES (?, ?, ?, ?)
+        """,
+            ("Films", "movies", 0, "auto"),
+        )
+        category_id = cursor.lastrowid
+        conn.commit()
+
+        assert get_category(cursor, category_id) == (category_id, "movies", "Films")
+        assert get_category(cursor, 999) is None
+
+        # Cached row is returned even after the underlying row changes
+        cursor.execute("UPDATE categories SET name = ? WHERE id = ?", ("Movies", category_id))
+        conn.commit()
+        assert get_category(cursor, category_id) == (category_id, "movies", "Films")
+
+        # Invalidation forces a fresh read
+        invalidate_category_cache(category_id)
+        assert get_category(cursor, category_id) == (category_id, "movies", "Movies")
+
+        conn.close()
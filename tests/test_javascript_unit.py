@@ -3,45 +3,14 @@ JavaScript Unit Tests using Node.js subprocess
 Tests pure JavaScript functions without browser dependency
 """
 
-import json
-import os
 import subprocess
-import tempfile
 
+import orjson
 import pytest
 
-
-@pytest.fixture
-def js_test_runner():
-    """Create a temporary JS file to run tests."""
-
-    def runner(js_code):
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".js", delete=False) as f:
-            # Write test code
-            f.write(js_code)
-            f.flush()
-
-            try:
-                # Run with Node.js
-                result = subprocess.run(["node", f.name], capture_output=True, text=True, timeout=5)
-
-                if result.returncode != 0:
-                    raise Exception(f"JavaScript error: {result.stderr}")
-
-                return result.stdout.strip()
-            finally:
-                # Clean up
-                os.unlink(f.name)
-
-    return runner
-
-
-class TestJavaScriptFunctions:
-    """Test pure JavaScript functions from script.js"""
-
-    def test_navigation_url_encoding(self, js_test_runner):
-        """Test URL encoding for category navigation."""
-        js_code = """
+# JavaScript test snippets keyed by name; all of them run in a single Node.js process
+_JS_SNIPPETS = {
+    "navigation": """
         // Mock navigateTo function
         function navigateTo(route) {
             if (route === '' || route === '/') {
@@ -70,14 +39,8 @@ class TestJavaScriptFunctions:
         });
 
         console.log(`${passed}/${tests.length} tests passed`);
-        """
-
-        output = js_test_runner(js_code)
-        assert "4/4 tests passed" in output
-
-    def test_category_name_encoding(self, js_test_runner):
-        """Test category name encoding/decoding."""
-        js_code = """
+        """,
+    "category_encoding": """
         // Test encoding and decoding category names
         const testCases = [
             'Books',
@@ -100,14 +63,8 @@ class TestJavaScriptFunctions:
         });
 
         console.log(`${passed}/${testCases.length} encoding tests passed`);
-        """
-
-        output = js_test_runner(js_code)
-        assert "5/5 encoding tests passed" in output
-
-    def test_view_mode_logic(self, js_test_runner):
-        """Test view mode toggle logic."""
-        js_code = """
+        """,
+    "view_mode": """
         // Mock view mode state
         let currentViewMode = 'grid';
 
@@ -128,26 +85,8 @@ class TestJavaScriptFunctions:
         // Test that invalid values are handled
         toggleItemView('invalid');
         console.log('After invalid toggle:', currentViewMode);
-        """
-
-        output = js_test_runner(js_code)
-        assert "Initial: grid" in output
-        assert "After list toggle: list" in output
-        assert "After grid toggle: grid" in output
-
-    @pytest.mark.skip(reason="Requires full script.js to be modularized")
-    def test_api_client_methods(self, js_test_runner):
-        """Test APIClient class methods."""
-        # This will be enabled after we extract APIClient to its own module
-        pass
-
-
-class TestURLRouting:
-    """Test URL routing logic"""
-
-    def test_hash_parsing(self, js_test_runner):
-        """Test hash route parsing logic."""
-        js_code = """
+        """,
+    "hash_parsing": """
         function parseHash(hash) {
             if (!hash || hash === '#') {
                 return { type: 'main' };
@@ -183,7 +122,85 @@ class TestURLRouting:
         });
 
         console.log(`${passed}/${tests.length} hash parsing tests passed`);
-        """
+        """,
+}
+
+# Runs each snippet in its own function scope with the console captured, then prints
+# {name: {"stdout", "stderr", "error"}} as one JSON object
+_JS_BATCH_PRELUDE = """
+const util = require('util');
+const results = {};
+
+function runSnippet(name, body) {
+    const stdout = [];
+    const stderr = [];
+    console.log = (...args) => stdout.push(util.format(...args));
+    console.error = (...args) => stderr.push(util.format(...args));
+    let error = null;
+    try {
+        body();
+    } catch (e) {
+        error = String((e && e.stack) || e);
+    }
+    results[name] = { stdout: stdout.join('\\n'), stderr: stderr.join('\\n'), error };
+}
+"""
+
+
+@pytest.fixture(scope="session")
+def js_results():
+    """Run every JavaScript snippet in one Node.js invocation and return the results keyed by name."""
+    script = _JS_BATCH_PRELUDE
+    for name, code in _JS_SNIPPETS.items():
+        script += f"runSnippet({orjson.dumps(name).decode()}, () => {{\n{code}\n}});\n"
+    script += "process.stdout.write(JSON.stringify(results));\n"
+
+    result = subprocess.run(["node", "-"], input=script, capture_output=True, encoding="utf-8", timeout=10)
+    if result.returncode != 0:
+        raise Exception(f"JavaScript error: {result.stderr}")
+
+    return orjson.loads(result.stdout)
+
+
+def _js_output(js_results, name):
+    """Console output of one snippet, raising if it threw."""
+    result = js_results[name]
+    if result["error"]:
+        raise Exception(f"JavaScript error: {result['error']}\n{result['stderr']}")
+    return result["stdout"]
+
 
-        output = js_test_runner(js_code)
+class TestJavaScriptFunctions:
+    """Test pure JavaScript functions from script.js"""
+
+    def test_navigation_url_encoding(self, js_results):
+        """Test URL encoding for category navigation."""
+        output = _js_output(js_results, "navigation")
+        assert "4/4 tests passed" in output
+
+    def test_category_name_encoding(self, js_results):
+        """Test category name encoding/decoding."""
+        output = _js_output(js_results, "category_encoding")
+        assert "5/5 encoding tests passed" in output
+
+    def test_view_mode_logic(self, js_results):
+        """Test view mode toggle logic."""
+        output = _js_output(js_results, "view_mode")
+        assert "Initial: grid" in output
+        assert "After list toggle: list" in output
+        assert "After grid toggle: grid" in output
+
+    @pytest.mark.skip(reason="Requires full script.js to be modularized")
+    def test_api_client_methods(self, js_results):
+        """Test APIClient class methods."""
+        # This will be enabled after we extract APIClient to its own module
+        pass
+
+
+class TestURLRouting:
+    """Test URL routing logic"""
+
+    def test_hash_parsing(self, js_results):
+        """Test hash route parsing logic."""
+        output = _js_output(js_results, "hash_parsing")
         assert "5/5 hash parsing tests passed" in output
@@ -2,9 +2,7 @@
 Tests for SQLite to SQLAlchemy migration functionality.
 """
 
-import os
 import sqlite3
-import tempfile
 from datetime import datetime
 
 import pytest
@@ -118,251 +116,136 @@ class TestMigration:
         conn.commit()
         conn.close()
 
-    def test_migrate_categories(self):
-        """Test migration of categories from old database."""
-        # Create temporary files
-        old_db_fd, old_db_path = tempfile.mkstemp()
-        new_db_fd, new_db_path = tempfile.mkstemp()
-
-        try:
-            # Create old database
-            self.create_old_database(old_db_path)
-
-            # Override config BEFORE creating app
-            import src.config
+    @pytest.fixture
+    def migration_app(self, tmp_path, monkeypatch):
+        """Create a minimal app on an empty database, with the config pointing at an old database to migrate."""
+        import src.config
 
-            original_path = src.config.Config.DATABASE_PATH
-            src.config.Config.DATABASE_PATH = old_db_path
+        # Create old database and point the config at it BEFORE creating app
+        old_db_path = str(tmp_path / "old.db")
+        self.create_old_database(old_db_path)
+        monkeypatch.setattr(src.config.Config, "DATABASE_PATH", old_db_path)
 
-            # Create minimal Flask app without calling create_app() to avoid migration
-            from flask import Flask
-            from flask_cors import CORS
+        # Create minimal Flask app without calling create_app() to avoid migration
+        from flask import Flask
+        from flask_cors import CORS
 
-            from src.models.database import db
+        app = Flask(__name__)
+        app.config["TESTING"] = True
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'new.db'}"
+        app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
-            app = Flask(__name__)
-            app.config["TESTING"] = True
-            app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{new_db_path}"
-            app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+        # Add CORS
+        CORS(app)
 
-            # Add CORS
-            CORS(app)
+        # Initialize SQLAlchemy with the app
+        db.init_app(app)
 
-            # Initialize SQLAlchemy with the app
-            db.init_app(app)
+        with app.app_context():
+            db.create_all()
 
-            with app.app_context():
-                db.create_all()
-                migrate_existing_data()
+        yield app
 
-                # Check migrated categories
-                categories = Category.query.all()
-                assert len(categories) == 2
+        with app.app_context():
+            db.engine.dispose()
 
-                books_cat = Category.query.filter_by(name="Old Books").first()
-                assert books_cat is not None
-                assert books_cat.type == "books"
-                assert books_cat.book_lookup_enabled is True
-                assert books_cat.book_lookup_source == "google_books"
+    def test_migrate_categories(self, migration_app):
+        """Test migration of categories from old database."""
+        with migration_app.app_context():
+            migrate_existing_data()
 
-                movies_cat = Category.query.filter_by(name="Old Movies").first()
-                assert movies_cat is not None
-                assert movies_cat.type == "movies"
-                assert movies_cat.book_lookup_enabled is False
+            # Check migrated categories
+            categories = Category.query.all()
+            assert len(categories) == 2
 
-            # Restore config
-            src.config.Config.DATABASE_PATH = original_path
+            books_cat = Category.query.filter_by(name="Old Books").first()
+            assert books_cat is not None
+            assert books_cat.type == "books"
+            assert books_cat.book_lookup_enabled is True
+            assert books_cat.book_lookup_source == "google_books"
 
-        finally:
-            # Clean up
-            os.close(old_db_fd)
-            os.close(new_db_fd)
-            os.unlink(old_db_path)
-            os.unlink(new_db_path)
+            movies_cat = Category.query.filter_by(name="Old Movies").first()
+            assert movies_cat is not None
+            assert movies_cat.type == "movies"
+            assert movies_cat.book_lookup_enabled is False
 
-    def test_migrate_items(self):
+    def test_migrate_items(self, migration_app):
         """Test migration of items from old database."""
-        old_db_fd, old_db_path = tempfile.mkstemp()
-        new_db_fd, new_db_path = tempfile.mkstemp()
-
-        try:
-            self.create_old_database(old_db_path)
-
-            # Override config BEFORE creating app
-            import src.config
-
-            original_path = src.config.Config.DATABASE_PATH
-            src.config.Config.DATABASE_PATH = old_db_path
-
-            # Create minimal Flask app
-            from flask import Flask
-            from flask_cors import CORS
-
-            from src.models.database import db
-
-            app = Flask(__name__)
-            app.config["TESTING"] = True
-            app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{new_db_path}"
-            app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-
-            CORS(app)
-            db.init_app(app)
-
-            with app.app_context():
-                db.create_all()
-                migrate_existing_data()
-
-                # Check migrated items
-                items = Item.query.all()
-                assert len(items) == 2
-
-                book_item = Item.query.filter_by(name="Old Book by Old Author").first()
-                assert book_item is not None
-                assert book_item.title == "Old Book"
-                assert book_item.author == "Old Author"
-                assert book_item.price == 19.99
-                assert book_item.bought is False
-                assert book_item.external_id == "book123"
-
-                movie_item = Item.query.filter_by(name="Old Movie (2020)").first()
-                assert movie_item is not None
-                assert movie_item.title == "Old Movie"
-                assert movie_item.director == "Old Director"
-                assert movie_item.year == 2020
-                assert movie_item.price == 12.99
-                assert movie_item.bought is True
-                assert movie_item.external_id == "movie456"
-
-            src.config.Config.DATABASE_PATH = original_path
-
-        finally:
-            os.close(old_db_fd)
-            os.close(new_db_fd)
-            os.unlink(old_db_path)
-            os.unlink(new_db_path)
-
-    def test_migrate_price_history(self):
+        with migration_app.app_context():
+            migrate_existing_data()
+
+            # Check migrated items
+            items = Item.query.all()
+            assert len(items) == 2
+
+            book_item = Item.query.filter_by(name="Old Book by Old Author").first()
+            assert book_item is not None
+            assert book_item.title == "Old Book"
+            assert book_item.author == "Old Author"
+            assert book_item.price == 19.99
+            assert book_item.bought is False
+            assert book_item.external_id == "book123"
+
+            movie_item = Item.query.filter_by(name="Old Movie (2020)").first()
+            assert movie_item is not None
+            assert movie_item.title == "Old Movie"
+            assert movie_item.director == "Old Director"
+            assert movie_item.year == 2020
+            assert movie_item.price == 12.99
+            assert movie_item.bought is True
+            assert movie_item.external_id == "movie456"
+
+    def test_migrate_price_history(self, migration_app):
         """Test migration of price history from old database."""
-        old_db_fd, old_db_path = tempfile.mkstemp()
-        new_db_fd, new_db_path = tempfile.mkstemp()
-
-        try:
-            self.create_old_database(old_db_path)
-
-            # Override config BEFORE creating app
-            import src.config
-
-            original_path = src.config.Config.DATABASE_PATH
-            src.config.Config.DATABASE_PATH = old_db_path
-
-            # Create minimal Flask app
-            from flask import Flask
-            from flask_cors import CORS
-
-            from src.models.database import db
-
-            app = Flask(__name__)
-            app.config["TESTING"] = True
-            app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{new_db_path}"
-            app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-
-            CORS(app)
-            db.init_app(app)
-
-            with app.app_context():
-                db.create_all()
-                migrate_existing_data()
-
-                # Check migrated price history
-                history = PriceHistory.query.all()
-                assert len(history) == 2
-
-                book_history = PriceHistory.query.filter_by(item_id=1).first()
-                assert book_history is not None
-                assert book_history.old_price == 24.99
-                assert book_history.new_price == 19.99
-                assert book_history.price_source == "google_books"
-                assert book_history.search_query == "Old Book Old Author"
-
-                movie_history = PriceHistory.query.filter_by(item_id=2).first()
-                assert movie_history is not None
-                assert movie_history.old_price == 15.99
-                assert movie_history.new_price == 12.99
-                assert movie_history.price_source == "apple"
-
-            src.config.Config.DATABASE_PATH = original_path
-
-        finally:
-            os.close(old_db_fd)
-            os.close(new_db_fd)
-            os.unlink(old_db_path)
-            os.unlink(new_db_path)
-
-    def test_migrate_relationships(self):
+        with migration_app.app_context():
+            migrate_existing_data()
+
+            # Check migrated price history
+            history = PriceHistory.query.all()
+            assert len(history) == 2
+
+            book_history = PriceHistory.query.filter_by(item_id=1).first()
+            assert book_history is not None
+            assert book_history.old_price == 24.99
+            assert book_history.new_price == 19.99
+            assert book_history.price_source == "google_books"
+            assert book_history.search_query == "Old Book Old Author"
+
+            movie_history = PriceHistory.query.filter_by(item_id=2).first()
+            assert movie_history is not None
+            assert movie_history.old_price == 15.99
+            assert movie_history.new_price == 12.99
+            assert movie_history.price_source == "apple"
+
+    def test_migrate_relationships(self, migration_app):
         """Test that relationships are maintained after migration."""
-        old_db_fd, old_db_path = tempfile.mkstemp()
-        new_db_fd, new_db_path = tempfile.mkstemp()
-
-        try:
-            self.create_old_database(old_db_path)
-
-            # Override config BEFORE creating app
-            import src.config
-
-            original_path = src.config.Config.DATABASE_PATH
-            src.config.Config.DATABASE_PATH = old_db_path
-
-            # Create minimal Flask app
-            from flask import Flask
-            from flask_cors import CORS
-
-            from src.models.database import db
-
-            app = Flask(__name__)
-            app.config["TESTING"] = True
-            app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{new_db_path}"
-            app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-
-            CORS(app)
-            db.init_app(app)
-
-            with app.app_context():
-                db.create_all()
-                migrate_existing_data()
-
-                # Test category -> items relationship
-                books_category = Category.query.filter_by(name="Old Books").first()
-                assert len(books_category.items) == 1
-                assert books_category.items[0].name == "Old Book by Old Author"
-
-                movies_category = Category.query.filter_by(name="Old Movies").first()
-                assert len(movies_category.items) == 1
-                assert movies_category.items[0].name == "Old Movie (2020)"
+        with migration_app.app_context():
+            migrate_existing_data()
 
-                # Test item -> price_history relationship
-                book_item = Item.query.filter_by(name="Old Book by Old Author").first()
-                assert len(book_item.price_history) == 1
-                assert book_item.price_history[0].old_price == 24.99
+            # Test category -> items relationship
+            books_category = Category.query.filter_by(name="Old Books").first()
+            assert len(books_category.items) == 1
+            assert books_category.items[0].name == "Old Book by Old Author"
 
-                movie_item = Item.query.filter_by(name="Old Movie (2020)").first()
-                assert len(movie_item.price_history) == 1
-                assert movie_item.price_history[0].price_source == "apple"
+            movies_category = Category.query.filter_by(name="Old Movies").first()
+            assert len(movies_category.items) == 1
+            assert movies_category.items[0].name == "Old Movie (2020)"
 
-            src.config.Config.DATABASE_PATH = original_path
+            # Test item -> price_history relationship
+            book_item = Item.query.filter_by(name="Old Book by Old Author").first()
+            assert len(book_item.price_history) == 1
+            assert book_item.price_history[0].old_price == 24.99
 
-        finally:
-            os.close(old_db_fd)
-            os.close(new_db_fd)
-            os.unlink(old_db_path)
-            os.unlink(new_db_path)
+            movie_item = Item.query.filter_by(name="Old Movie (2020)").first()
+            assert len(movie_item.price_history) == 1
+            assert movie_item.price_history[0].price_source == "apple"
 
-    def test_migrate_no_existing_database(self):
+    def test_migrate_no_existing_database(self, monkeypatch):
         """Test migration behavior when no existing database exists."""
         # Override config BEFORE creating app
         import src.config
 
-        original_path = src.config.Config.DATABASE_PATH
-        src.config.Config.DATABASE_PATH = "/nonexistent/path/database.db"
+        monkeypatch.setattr(src.config.Config, "DATABASE_PATH", "/nonexistent/path/database.db")
 
         # Create minimal Flask app
         from flask import Flask
@@ -378,66 +261,26 @@ class TestMigration:
         CORS(app)
         db.init_app(app)
 
-        try:
-            with app.app_context():
-                db.create_all()
-                # Should not raise an exception
-                migrate_existing_data()
+        with app.app_context():
+            db.create_all()
+            # Should not raise an exception
+            migrate_existing_data()
 
-                # Should have empty database
-                assert Category.query.count() == 0
-                assert Item.query.count() == 0
-                assert PriceHistory.query.count() == 0
+            # Should have empty database
+            assert Category.query.count() == 0
+            assert Item.query.count() == 0
+            assert PriceHistory.query.count() == 0
 
-        finally:
-            src.config.Config.DATABASE_PATH = original_path
-
-    def test_migrate_duplicate_prevention(self):
+    def test_migrate_duplicate_prevention(self, migration_app):
         """Test that migration prevents duplicate entries."""
-        old_db_fd, old_db_path = tempfile.mkstemp()
-        new_db_fd, new_db_path = tempfile.mkstemp()
-
-        try:
-            self.create_old_database(old_db_path)
-
-            # Override config BEFORE creating app
-            import src.config
-
-            original_path = src.config.Config.DATABASE_PATH
-            src.config.Config.DATABASE_PATH = old_db_path
-
-            # Create minimal Flask app
-            from flask import Flask
-            from flask_cors import CORS
-
-            from src.models.database import db
-
-            app = Flask(__name__)
-            app.config["TESTING"] = True
-            app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{new_db_path}"
-            app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-
-            CORS(app)
-            db.init_app(app)
-
-            with app.app_context():
-                db.create_all()
-
-                # First migration
-                migrate_existing_data()
-                first_count = Category.query.count()
-
-                # Second migration (should not create duplicates)
-                migrate_existing_data()
-                second_count = Category.query.count()
-
-                assert first_count == second_count
-                assert first_count == 2  # Should still be 2 categories
+        with migration_app.app_context():
+            # First migration
+            migrate_existing_data()
+            first_count = Category.query.count()
 
-            src.config.Config.DATABASE_PATH = original_path
+            # Second migration (should not create duplicates)
+            migrate_existing_data()
+            second_count = Category.query.count()
 
-        finally:
-            os.close(old_db_fd)
-            os.close(new_db_fd)
-            os.unlink(old_db_path)
-            os.unlink(new_db_path)
+            assert first_count == second_count
+            assert first_count == 2  # Should still be 2 categories
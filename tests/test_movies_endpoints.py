@@ -2,69 +2,72 @@
 Tests for movie endpoints.
 """
 
+import csv
+import io
 import json
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
+from werkzeug.test import EnvironBuilder
 
 from src.models.database import Category, Item, PendingMovieSearch, db
+from src.routes import movies
+from src.services.movie_search import APPLE_SEARCH_PREFETCH
 
 
 class TestMoviesEndpoints:
     """Test movie endpoints."""
 
     @patch("src.routes.movies.search_apple_movies")
-    def test_search_movies_success(self, mock_search, sqlalchemy_app, sqlalchemy_client):
+    def test_search_movies_success(self, mock_search, sqlalchemy_client):
         """Test successful movie search."""
-        with sqlalchemy_app.app_context():
-            # Mock the search response
-            mock_search.return_value = {
-                "movies": [
-                    {
-                        "title": "Test Movie",
-                        "director": "Test Director",
-                        "year": 2023,
-                        "price": 14.99,
-                        "thumbnail": "https://example.com/movie.jpg",
-                        "trackId": "123456",
-                        "priceSource": "apple",
-                    }
-                ],
-                "total": 1,
-            }
-
-            response = sqlalchemy_client.get("/api/movies/search?q=test")
-
-            assert response.status_code == 200
-            data = json.loads(response.data)
-            assert "movies" in data
-            assert len(data["movies"]) == 1
-            assert data["movies"][0]["title"] == "Test Movie"
-            assert data["total"] == 1
-
-    def test_search_movies_missing_query(self, sqlalchemy_app, sqlalchemy_client):
+        # Mock the search response
+        mock_search.return_value = {
+            "movies": [
+                {
+                    "title": "Test Movie",
+                    "director": "Test Director",
+                    "year": 2023,
+                    "price": 14.99,
+                    "thumbnail": "https://example.com/movie.jpg",
+                    "trackId": "123456",
+                    "priceSource": "apple",
+                }
+            ],
+            "total": 1,
+        }
+
+        response = sqlalchemy_client.get("/api/movies/search?q=test")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert "movies" in data
+        assert len(data["movies"]) == 1
+        assert data["movies"][0]["title"] == "Test Movie"
+        assert data["total"] == 1
+
+    def test_search_movies_missing_query(self, sqlalchemy_client):
         """Test movie search without query parameter."""
-        with sqlalchemy_app.app_context():
-            response = sqlalchemy_client.get("/api/movies/search")
+        response = sqlalchemy_client.get("/api/movies/search")
 
-            assert response.status_code == 400
-            data = json.loads(response.data)
-            assert "error" in data
-            assert "Search query is required" in data["error"]
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert "error" in data
+        assert "Search query is required" in data["error"]
 
     @patch("src.routes.movies.search_apple_movies")
-    def test_search_movies_with_exception(self, mock_search, sqlalchemy_app, sqlalchemy_client):
+    def test_search_movies_with_exception(self, mock_search, sqlalchemy_client):
         """Test movie search error handling."""
-        with sqlalchemy_app.app_context():
-            # Mock an exception
-            mock_search.side_effect = Exception("API Error")
+        # Mock an exception
+        mock_search.side_effect = Exception("API Error")
 
-            response = sqlalchemy_client.get("/api/movies/search?q=test")
+        response = sqlalchemy_client.get("/api/movies/search?q=test")
 
-            assert response.status_code == 500
-            data = json.loads(response.data)
-            assert "error" in data
-            assert "Failed to search movies" in data["error"]
+        assert response.status_code == 500
+        data = json.loads(response.data)
+        assert "error" in data
+        assert "Failed to search movies" in data["error"]
 
     def test_create_batch_search(self, sqlalchemy_app, sqlalchemy_client):
         """Test creating a batch movie search."""
@@ -97,33 +100,31 @@ class TestMoviesEndpoints:
             pending = PendingMovieSearch.query.filter_by(category_id=category.id).all()
             assert len(pending) >= 2
 
-    def test_create_batch_search_missing_data(self, sqlalchemy_app, sqlalchemy_client):
+    def test_create_batch_search_missing_data(self, sqlalchemy_client):
         """Test batch search with missing data."""
-        with sqlalchemy_app.app_context():
-            response = sqlalchemy_client.post(
-                "/api/movies/batch-search",
-                data=json.dumps({}),
-                content_type="application/json",
-            )
+        response = sqlalchemy_client.post(
+            "/api/movies/batch-search",
+            data=json.dumps({}),
+            content_type="application/json",
+        )
 
-            assert response.status_code == 400
-            data = json.loads(response.data)
-            assert "error" in data
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert "error" in data
 
-    def test_create_batch_search_invalid_category(self, sqlalchemy_app, sqlalchemy_client):
+    def test_create_batch_search_invalid_category(self, sqlalchemy_client):
         """Test batch search with invalid category."""
-        with sqlalchemy_app.app_context():
-            batch_data = {"category_id": 99999, "movies": [{"title": "Movie 1"}]}
+        batch_data = {"category_id": 99999, "movies": [{"title": "Movie 1"}]}
 
-            response = sqlalchemy_client.post(
-                "/api/movies/batch-search",
-                data=json.dumps(batch_data),
-                content_type="application/json",
-            )
+        response = sqlalchemy_client.post(
+            "/api/movies/batch-search",
+            data=json.dumps(batch_data),
+            content_type="application/json",
+        )
 
-            assert response.status_code == 404
-            data = json.loads(response.data)
-            assert "error" in data
+        assert response.status_code == 404
+        data = json.loads(response.data)
+        assert "error" in data
 
     def test_get_batch_search_status(self, sqlalchemy_app, sqlalchemy_client):
         """Test getting batch search status."""
@@ -189,3 +190,325 @@ class TestMoviesEndpoints:
             # Verify searches were deleted
             remaining = PendingMovieSearch.query.filter_by(category_id=category.id, status="pending").count()
             assert remaining == 0
+
+    def test_add_manual_movie_returns_item_id(self, sqlalchemy_file_app, sqlalchemy_file_client):
+        """Test that manually added movies report the id of the created item."""
+        with sqlalchemy_file_app.app_context():
+            category = Category.query.filter_by(type="movies").first()
+
+            response = sqlalchemy_file_client.post(
+                "/api/movies/add-manual-movie",
+                data=json.dumps({"category_id": category.id, "title": "Heat", "year": 1995, "price": 5.99}),
+                content_type="application/json",
+            )
+
+            assert response.status_code == 200
+            data = json.loads(response.data)
+            item = db.session.get(Item, data["movie"]["id"])
+            assert item is not None
+            assert item.name == "Heat (1995)"
+
+    def test_add_manual_movie_rejects_non_movie_category(self, sqlalchemy_file_app, sqlalchemy_file_client):
+        """Test that manual movie entry validates the target category."""
+        with sqlalchemy_file_app.app_context():
+            category = Category.query.filter_by(type="books").first()
+
+            response = sqlalchemy_file_client.post(
+                "/api/movies/add-manual-movie",
+                data=json.dumps({"category_id": category.id, "title": "Heat"}),
+                content_type="application/json",
+            )
+            assert response.status_code == 400
+
+            response = sqlalchemy_file_client.post(
+                "/api/movies/add-manual-movie",
+                data=json.dumps({"category_id": 99999, "title": "Heat"}),
+                content_type="application/json",
+            )
+            assert response.status_code == 404
+
+    @patch("src.services.movie_search.search_apple_movies")
+    def test_import_csv_inserts_found_movies(
+        self, mock_search, sqlalchemy_file_app, sqlalchemy_file_client, monkeypatch
+    ):
+        """Test that CSV import writes every resolved movie and reports rows it skipped."""
+        # Flush inserts after every movie
+        monkeypatch.setattr("src.routes.movies.CSV_INSERT_BATCH_SIZE", 1)
+        import_slots = threading.BoundedSemaphore(1)
+        monkeypatch.setattr("src.routes.movies.csv_import_semaphore", import_slots)
+
+        search_results = {
+            "Alien": {"movies": [{"title": "Alien", "year": 1979, "price": 4.99, "url": "https://example.com/alien"}]},
+            "Missing": {"movies": [], "error": "No results"},
+            "Up": {"movies": [{"title": "Up", "year": 2009, "price": 3.99, "url": "https://example.com/up"}]},
+        }
+        mock_search.side_effect = search_results.get
+
+        with sqlalchemy_file_app.app_context():
+            category = Category.query.filter_by(type="movies").first()
+            csv_file = io.BytesIO(b"title,director,year\nAlien,Ridley Scott,1979\nMissing,,\n,,\nUp,,2009\n")
+
+            response = sqlalchemy_file_client.post(
+                "/api/movies/import-csv",
+                data={"category_id": str(category.id), "file": (csv_file, "movies.csv")},
+                content_type="multipart/form-data",
+            )
+
+            assert response.status_code == 200
+            data = json.loads(response.data)
+            response.close()
+            assert data["success"] is True
+            results = data["results"]
+            assert results["total"] == 4
+            assert results["imported"] == 2
+            assert results["failed"] == 2
+            assert [movie["title"] for movie in results["imported_movies"]] == ["Alien", "Up"]
+
+            # The import slot is held while the response streams and released once it is closed
+            assert import_slots.acquire(blocking=False)
+            assert sorted(call.args[0] for call in mock_search.call_args_list) == ["Alien", "Missing", "Up"]
+
+            titles = {item.title for item in Item.query.filter_by(category_id=category.id).all()}
+            assert {"Alien", "Up"} <= titles
+
+    def test_import_csv_rejects_when_imports_saturated(self, sqlalchemy_client, monkeypatch):
+        """Test that CSV uploads get 429 with Retry-After while the import limit is reached."""
+        import_slots = threading.BoundedSemaphore(1)
+        monkeypatch.setattr("src.routes.movies.csv_import_semaphore", import_slots)
+
+        import_slots.acquire()
+        try:
+            response = sqlalchemy_client.post(
+                "/api/movies/import-csv",
+                data={"category_id": "1", "file": (io.BytesIO(b"title\nAlien\n"), "movies.csv")},
+                content_type="multipart/form-data",
+            )
+        finally:
+            import_slots.release()
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "10"
+
+    @pytest.mark.parametrize("endpoint", ["preview-csv", "import-csv"])
+    @patch("src.services.movie_search.search_apple_movies")
+    @patch("src.routes.movies.search_apple_movies")
+    def test_csv_upload_with_invalid_utf8_is_rejected(
+        self, mock_route_search, mock_search, endpoint, sqlalchemy_file_app, sqlalchemy_file_client
+    ):
+        """Test that a byte that is not UTF-8 past the first read buffer still gets a 400 and stores nothing."""
+        mock_route_search.return_value = mock_search.return_value = {"movies": [], "error": "No results"}
+
+        with sqlalchemy_file_app.app_context():
+            category = Category.query.filter_by(type="movies").first()
+            items_before = Item.query.filter_by(category_id=category.id).count()
+
+            rows = b"".join(b"Movie %d,,\n" % i for i in range(1000))
+            assert len(rows) > 8192
+            csv_file = io.BytesIO(b"title,director,year\n" + rows + b"Caf\xe9,,\n")
+
+            response = sqlalchemy_file_client.post(
+                f"/api/movies/{endpoint}",
+                data={"category_id": str(category.id), "file": (csv_file, "movies.csv")},
+                content_type="multipart/form-data",
+            )
+
+            assert response.status_code == 400
+            assert "Failed to parse CSV file" in response.get_json()["error"]
+            assert Item.query.filter_by(category_id=category.id).count() == items_before
+            if endpoint == "import-csv":
+                # The encoding is checked before any row is looked up
+                mock_search.assert_not_called()
+
+    @patch("src.services.movie_search.search_apple_movies")
+    def test_import_csv_failing_partway_reports_only_stored_movies(
+        self, mock_search, sqlalchemy_file_app, sqlalchemy_file_client, monkeypatch
+    ):
+        """Test that a streamed import that fails partway only lists and counts movies that were committed."""
+        monkeypatch.setattr("src.routes.movies.CSV_INSERT_BATCH_SIZE", 2)
+
+        def search(title):
+            if title == "Boom":
+                raise RuntimeError("lookup failed")
+            return {"movies": [{"title": title, "price": 4.99, "url": f"https://example.com/{title}"}]}
+
+        mock_search.side_effect = search
+
+        with sqlalchemy_file_app.app_context():
+            category = Category.query.filter_by(type="movies").first()
+            csv_file = io.BytesIO(b"title\nAlien\nHeat\nUp\nBoom\nJaws\n")
+
+            response = sqlalchemy_file_client.post(
+                "/api/movies/import-csv",
+                data={"category_id": str(category.id), "file": (csv_file, "movies.csv")},
+                content_type="multipart/form-data",
+            )
+
+            assert response.status_code == 200
+            results = json.loads(response.data)["results"]
+            response.close()
+            stored = {item.title for item in Item.query.filter_by(category_id=category.id).all()}
+
+            # The first batch was committed; "Up" was still waiting for its batch and was rolled back
+            assert [movie["title"] for movie in results["imported_movies"]] == ["Alien", "Heat"]
+            assert results["imported"] == 2
+            assert {"Alien", "Heat"} <= stored
+            assert not stored & {"Up", "Boom", "Jaws"}
+
+    @patch("src.services.movie_search.search_apple_movies")
+    def test_import_csv_failing_partway_keeps_committed_batches(
+        self, mock_search, sqlalchemy_file_app, sqlalchemy_file_client, monkeypatch
+    ):
+        """Test that an import failing partway through the file reports the movies already stored."""
+        monkeypatch.setattr("src.routes.movies.CSV_INSERT_BATCH_SIZE", 1)
+        insert_movie_items = movies.insert_movie_items
+        insert_calls = []
+
+        def insert_then_fail(cursor, rows):
+            insert_calls.append(rows)
+            if len(insert_calls) > 1:
+                raise RuntimeError("disk I/O error")
+            insert_movie_items(cursor, rows)
+
+        monkeypatch.setattr("src.routes.movies.insert_movie_items", insert_then_fail)
+        mock_search.side_effect = lambda title: {
+            "movies": [{"title": title, "price": 4.99, "url": f"https://example.com/{title}"}]
+        }
+
+        with sqlalchemy_file_app.app_context():
+            category = Category.query.filter_by(type="movies").first()
+            csv_file = io.BytesIO(b"title\nAlien\nHeat\nUp\n")
+
+            response = sqlalchemy_file_client.post(
+                "/api/movies/import-csv",
+                data={"category_id": str(category.id), "file": (csv_file, "movies.csv")},
+                content_type="multipart/form-data",
+            )
+
+            data = json.loads(response.data)
+            response.close()
+            assert data["success"] is True
+            assert "before the import stopped" in data["message"]
+            results = data["results"]
+            assert results["imported"] == 1
+            assert [movie["title"] for movie in results["imported_movies"]] == ["Alien"]
+            assert "Import stopped early: disk I/O error" in results["errors"]
+
+            stored = {item.title for item in Item.query.filter_by(category_id=category.id).all()}
+            assert "Alien" in stored
+            assert not stored & {"Heat", "Up"}
+
+    @patch("src.services.movie_search.search_apple_movies")
+    def test_import_csv_failing_before_first_commit_stores_nothing(
+        self, mock_search, sqlalchemy_file_app, sqlalchemy_file_client, monkeypatch
+    ):
+        """Test that an import failing before any batch is committed reports failure."""
+        monkeypatch.setattr("src.routes.movies.insert_movie_items", MagicMock(side_effect=RuntimeError("locked")))
+        mock_search.side_effect = lambda title: {
+            "movies": [{"title": title, "price": 4.99, "url": f"https://example.com/{title}"}]
+        }
+
+        with sqlalchemy_file_app.app_context():
+            category = Category.query.filter_by(type="movies").first()
+            items_before = Item.query.filter_by(category_id=category.id).count()
+
+            response = sqlalchemy_file_client.post(
+                "/api/movies/import-csv",
+                data={"category_id": str(category.id), "file": (io.BytesIO(b"title\nAlien\n"), "movies.csv")},
+                content_type="multipart/form-data",
+            )
+
+            data = json.loads(response.data)
+            response.close()
+            assert data["success"] is False
+            assert data["message"] == "Failed to import CSV file"
+            assert data["results"]["imported"] == 0
+            assert Item.query.filter_by(category_id=category.id).count() == items_before
+
+    def test_import_csv_releases_slot_when_response_closed_unread(self, sqlalchemy_file_app, monkeypatch):
+        """Test that a server closing a streamed import response before reading any of it frees the import slot."""
+        import_slots = threading.BoundedSemaphore(1)
+        monkeypatch.setattr("src.routes.movies.csv_import_semaphore", import_slots)
+
+        with sqlalchemy_file_app.app_context():
+            category = Category.query.filter_by(type="movies").first()
+
+        # Call the WSGI app directly: the test client would already have pulled the first chunk
+        environ = EnvironBuilder(
+            method="POST",
+            path="/api/movies/import-csv",
+            data={"category_id": str(category.id), "file": (io.BytesIO(b"title\nAlien\n"), "movies.csv")},
+            content_type="multipart/form-data",
+        ).get_environ()
+        statuses = []
+        body = sqlalchemy_file_app(environ, lambda status, headers: statuses.append(status))
+
+        assert statuses == ["200 OK"]
+        assert not import_slots.acquire(blocking=False)
+
+        body.close()
+        body.close()
+
+        # Released exactly once, so the bounded semaphore is back at its single slot
+        assert import_slots.acquire(blocking=False)
+        assert not import_slots.acquire(blocking=False)
+
+    @patch("src.services.movie_search.search_apple_movies")
+    def test_import_csv_encoding_check_handles_characters_split_across_chunks(
+        self, mock_search, sqlalchemy_file_app, sqlalchemy_file_client, monkeypatch
+    ):
+        """Test that the up-front UTF-8 check accepts multi-byte characters that straddle two chunks."""
+        monkeypatch.setattr("src.routes.movies.CSV_ENCODING_CHECK_CHUNK_SIZE", 1)
+        mock_search.side_effect = lambda title: {
+            "movies": [{"title": title, "price": 4.99, "url": "https://example.com/amelie"}]
+        }
+
+        with sqlalchemy_file_app.app_context():
+            category = Category.query.filter_by(type="movies").first()
+
+            response = sqlalchemy_file_client.post(
+                "/api/movies/import-csv",
+                data={"category_id": str(category.id), "file": (io.BytesIO("title\nAmélie\n".encode()), "movies.csv")},
+                content_type="multipart/form-data",
+            )
+
+            data = json.loads(response.data)
+            response.close()
+            assert data["success"] is True
+            assert [movie["title"] for movie in data["results"]["imported_movies"]] == ["Amélie"]
+
+    @patch("src.services.movie_search.search_apple_movies")
+    def test_import_csv_malformed_row_partway_keeps_earlier_batches(
+        self, mock_search, sqlalchemy_file_app, sqlalchemy_file_client, monkeypatch
+    ):
+        """Test that rows are parsed as the import runs, so a malformed row late in the file stops it there."""
+        monkeypatch.setattr("src.routes.movies.CSV_INSERT_BATCH_SIZE", 1)
+        mock_search.side_effect = lambda title: {
+            "movies": [{"title": title, "price": 4.99, "url": f"https://example.com/{title}"}]
+        }
+
+        with sqlalchemy_file_app.app_context():
+            category = Category.query.filter_by(type="movies").first()
+            # A field over csv.field_size_limit() makes the reader raise csv.Error on that row
+            oversized = b"x" * (csv.field_size_limit() + 1)
+            titles = [f"Movie {i}" for i in range(APPLE_SEARCH_PREFETCH + 4)]
+            rows = "".join(f"{title}\n" for title in titles).encode()
+            csv_file = io.BytesIO(b"title\n" + rows + oversized + b"\nUp\n")
+
+            response = sqlalchemy_file_client.post(
+                "/api/movies/import-csv",
+                data={"category_id": str(category.id), "file": (csv_file, "movies.csv")},
+                content_type="multipart/form-data",
+            )
+
+            assert response.status_code == 200
+            data = json.loads(response.data)
+            response.close()
+            # Movies were looked up and committed before the reader got as far as the malformed row
+            assert data["success"] is True
+            imported = [movie["title"] for movie in data["results"]["imported_movies"]]
+            assert imported and imported == titles[: len(imported)]
+            assert any(error.startswith("Import stopped early") for error in data["results"]["errors"])
+
+            stored = {item.title for item in Item.query.filter_by(category_id=category.id).all()}
+            assert set(imported) <= stored
+            assert not stored & (set(titles[len(imported) :]) | {"Up"})
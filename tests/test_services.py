@@ -2,18 +2,29 @@
 Tests for service layer (book and movie search services).
 """
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
+import orjson
 import pytest
 import requests
 
+from src.services import movie_search
 from src.services.book_search import get_mock_results, search_google_books
+from src.services.cache import TTLCache
+from src.services.http import RateLimiter
 from src.services.movie_search import (
+    MOVIE_DESCRIPTION_MAX_LENGTH,
     extract_year_from_release_date,
     generate_estimated_movie_price,
     get_apple_pricing,
     get_mock_movie_results,
+    get_price_priority,
     get_movie_by_track_id,
+    get_movies_by_track_ids,
+    iter_apple_movie_searches,
     search_apple_movies,
     search_tmdb_movies,
 )
@@ -22,32 +33,34 @@ from src.services.movie_search import (
 class TestBookSearchService:
     """Test book search service functions."""
 
-    @patch("requests.get")
+    @patch("src.services.book_search.http_session.get")
     def test_search_google_books_success(self, mock_get):
         """Test successful Google Books search."""
         # Mock response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "items": [
-                {
-                    "id": "book123",
-                    "volumeInfo": {
-                        "title": "Test Book",
-                        "authors": ["Test Author"],
-                        "publisher": "Test Publisher",
-                        "publishedDate": "2023-01-01",
-                        "description": "Test description",
-                        "industryIdentifiers": [{"type": "ISBN_13", "identifier": "1234567890123"}],
-                        "pageCount": 300,
-                        "categories": ["Fiction"],
-                        "imageLinks": {"thumbnail": "https://example.com/thumb.jpg"},
-                    },
-                    "saleInfo": {"listPrice": {"amount": 19.99, "currencyCode": "GBP"}},
-                }
-            ],
-            "totalItems": 1,
-        }
+        mock_response.content = orjson.dumps(
+            {
+                "items": [
+                    {
+                        "id": "book123",
+                        "volumeInfo": {
+                            "title": "Test Book",
+                            "authors": ["Test Author"],
+                            "publisher": "Test Publisher",
+                            "publishedDate": "2023-01-01",
+                            "description": "Test description",
+                            "industryIdentifiers": [{"type": "ISBN_13", "identifier": "1234567890123"}],
+                            "pageCount": 300,
+                            "categories": ["Fiction"],
+                            "imageLinks": {"thumbnail": "https://example.com/thumb.jpg"},
+                        },
+                        "saleInfo": {"listPrice": {"amount": 19.99, "currencyCode": "GBP"}},
+                    }
+                ],
+                "totalItems": 1,
+            }
+        )
         mock_get.return_value = mock_response
 
         result = search_google_books("test query")
@@ -58,7 +71,30 @@ class TestBookSearchService:
         assert result["books"][0]["price"] == 19.99
         assert result["source"] == "google_books"
 
-    @patch("requests.get")
+    @patch("src.services.book_search.http_session.get")
+    def test_search_google_books_cache_hands_out_copies(self, mock_get):
+        """Test that changing a returned result doesn't change what later searches get from the cache."""
+        mock_response = MagicMock()
+        mock_response.ok = True
+        mock_response.content = orjson.dumps(
+            {
+                "items": [
+                    {
+                        "volumeInfo": {"title": "Dune", "authors": ["Frank Herbert"]},
+                        "saleInfo": {"listPrice": {"amount": 9.99, "currencyCode": "GBP"}},
+                    }
+                ]
+            }
+        )
+        mock_get.return_value = mock_response
+
+        first = search_google_books("Dune")
+        first["books"][0]["price"] = 0
+
+        assert search_google_books("dune")["books"][0]["price"] == 9.99
+        assert mock_get.call_count == 1
+
+    @patch("src.services.book_search.http_session.get")
     def test_search_google_books_api_error(self, mock_get):
         """Test Google Books search with API error."""
         mock_get.side_effect = requests.RequestException("API Error")
@@ -86,12 +122,12 @@ class TestBookSearchService:
         assert "author" in book
         assert "price" in book
 
-    @patch("requests.get")
+    @patch("src.services.book_search.http_session.get")
     def test_search_google_books_no_items(self, mock_get):
         """Test Google Books search with no results."""
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"totalItems": 0}
+        mock_response.content = orjson.dumps({"totalItems": 0})
         mock_get.return_value = mock_response
 
         result = search_google_books("nonexistent book")
@@ -105,28 +141,30 @@ class TestBookSearchService:
 class TestMovieSearchService:
     """Test movie search service functions."""
 
-    @patch("requests.get")
+    @patch("src.services.movie_search.http_session.get")
     def test_search_apple_movies_success(self, mock_get):
         """Test successful Apple movie search."""
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "resultCount": 1,
-            "results": [
-                {
-                    "trackId": 123456,
-                    "trackName": "Test Movie",
-                    "artistName": "Test Director",
-                    "releaseDate": "2023-01-01T00:00:00Z",
-                    "trackPrice": 14.99,
-                    "currency": "GBP",
-                    "artworkUrl100": "https://example.com/movie.jpg",
-                    "longDescription": "Test description",
-                    "trackTimeMillis": 7200000,
-                    "primaryGenreName": "Action",
-                }
-            ],
-        }
+        mock_response.content = orjson.dumps(
+            {
+                "resultCount": 1,
+                "results": [
+                    {
+                        "trackId": 123456,
+                        "trackName": "Test Movie",
+                        "artistName": "Test Director",
+                        "releaseDate": "2023-01-01T00:00:00Z",
+                        "trackPrice": 14.99,
+                        "currency": "GBP",
+                        "artworkUrl100": "https://example.com/movie.jpg",
+                        "longDescription": "Test description",
+                        "trackTimeMillis": 7200000,
+                        "primaryGenreName": "Action",
+                    }
+                ],
+            }
+        )
         mock_get.return_value = mock_response
 
         result = search_apple_movies("test movie")
@@ -137,15 +175,272 @@ class TestMovieSearchService:
         assert result["movies"][0]["price"] == 14.99
         assert result["movies"][0]["trackId"] == 123456
 
-    @patch("requests.get")
+    @patch("src.services.movie_search.http_session.get")
+    def test_search_apple_movies_sort_order(self, mock_get):
+        """Test that standalone movies come first, then by price source and price."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps(
+            {
+                "resultCount": 5,
+                "results": [
+                    {"trackName": "Bundle", "trackHdPrice": 9.99, "longDescription": "The Complete Bundle"},
+                    {"trackName": "Rental", "trackRentalPrice": 3.49},
+                    {"trackName": "Purchase", "trackPrice": 7.99},
+                    {"trackName": "HD", "trackHdPrice": 11.99, "longDescription": None},
+                    {
+                        "trackName": "Box Set",
+                        "trackPrice": 2.99,
+                        "trackViewUrl": "https://itunes.apple.com/gb/movie-collection/box-set/id1",
+                    },
+                ],
+            }
+        )
+        mock_get.return_value = mock_response
+
+        result = search_apple_movies("sort test")
+
+        assert [movie["title"] for movie in result["movies"]] == ["HD", "Purchase", "Rental", "Bundle", "Box Set"]
+
+    @patch("src.services.movie_search.http_session.get")
+    def test_search_apple_movies_skips_untitled_results(self, mock_get):
+        """Test that untitled items don't take one of the returned result slots."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps(
+            {
+                "resultCount": 15,
+                "results": [{"trackPrice": 1.99}] * 3
+                + [{"trackName": f"Movie {i}", "trackPrice": 4.99} for i in range(12)],
+            }
+        )
+        mock_get.return_value = mock_response
+
+        result = search_apple_movies("untitled test")
+
+        assert [movie["title"] for movie in result["movies"]] == [f"Movie {i}" for i in range(10)]
+
+    @patch("src.services.movie_search.http_session.get")
+    def test_search_apple_movies_trims_descriptions(self, mock_get):
+        """Test that results prefer the short description and cap long ones."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps(
+            {
+                "resultCount": 2,
+                "results": [
+                    {"trackName": "Short", "trackPrice": 4.99, "shortDescription": "Brief", "longDescription": "Long"},
+                    {"trackName": "Long", "trackPrice": 5.99, "longDescription": "x" * 5000},
+                ],
+            }
+        )
+        mock_get.return_value = mock_response
+
+        result = search_apple_movies("description test")
+
+        descriptions = {movie["title"]: movie["description"] for movie in result["movies"]}
+        assert descriptions["Short"] == "Brief"
+        assert len(descriptions["Long"]) == MOVIE_DESCRIPTION_MAX_LENGTH
+
+    @patch("src.services.movie_search.http_session.get")
+    def test_search_apple_movies_caches_results(self, mock_get):
+        """Test that repeated searches for the same title reuse the first response."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps({"resultCount": 1, "results": [{"trackName": "Heat", "trackPrice": 4.99}]})
+        mock_get.return_value = mock_response
+
+        first = search_apple_movies("Heat")
+        second = search_apple_movies("  heat ")
+
+        assert mock_get.call_count == 1
+        assert second["movies"] == first["movies"]
+        assert second["debug"]["cache_hit"] is True
+
+    @patch("src.services.movie_search.http_session.get")
+    def test_search_apple_movies_cache_hands_out_copies(self, mock_get):
+        """Test that changing a returned result doesn't change what later searches get from the cache."""
+        mock_response = MagicMock()
+        mock_response.ok = True
+        mock_response.content = orjson.dumps({"resultCount": 1, "results": [{"trackName": "Heat", "trackPrice": 4.99}]})
+        mock_get.return_value = mock_response
+
+        search_apple_movies("Heat")["movies"][0]["price"] = 0
+        second = search_apple_movies("Heat")
+        second["movies"].clear()
+
+        assert search_apple_movies("Heat")["movies"][0]["price"] == 4.99
+        assert mock_get.call_count == 1
+
+    @patch("src.services.movie_search.http_session.get")
+    def test_search_apple_movies_shares_concurrent_lookups(self, mock_get):
+        """Test that concurrent searches for the same title share a single API call."""
+
+        def slow_get(url, params, timeout):
+            time.sleep(0.2)
+            response = MagicMock()
+            response.ok = True
+            response.content = orjson.dumps({"resultCount": 0, "results": []})
+            return response
+
+        mock_get.side_effect = slow_get
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(search_apple_movies, ["Heat", "heat", " Heat "]))
+
+        assert mock_get.call_count == 1
+        assert all(result["movies"] == [] for result in results)
+        assert sum(bool(result["debug"].get("shared_lookup")) for result in results) == 2
+
+    @patch("src.services.movie_search.http_session.get")
+    def test_search_apple_movies_stops_waiting_on_slow_shared_lookup(self, mock_get, monkeypatch):
+        """Test that a caller gives up on a shared lookup that outlasts the wait and searches itself."""
+        monkeypatch.setattr(movie_search, "APPLE_SEARCH_SHARED_WAIT", 0.05)
+        owner_started = threading.Event()
+        release_owner = threading.Event()
+
+        def fake_get(url, params, timeout):
+            if not owner_started.is_set():
+                owner_started.set()
+                release_owner.wait(timeout=2)
+            response = MagicMock()
+            response.ok = True
+            response.content = orjson.dumps({"resultCount": 0, "results": []})
+            return response
+
+        mock_get.side_effect = fake_get
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            owner = executor.submit(search_apple_movies, "Heat")
+            assert owner_started.wait(timeout=2)
+
+            result = search_apple_movies("Heat")
+
+            assert "shared_lookup" not in result["debug"]
+            assert result["debug"]["api_calls"][0]["search_term"] == "Heat"
+            release_owner.set()
+            owner.result()
+
+        assert mock_get.call_count == 2
+
+    @patch("src.services.movie_search.http_session.get")
+    def test_search_apple_movies_query_variations(self, mock_get):
+        """Test that only distinct query variations are sent to the API."""
+        mock_response = MagicMock()
+        mock_response.ok = True
+        mock_response.content = orjson.dumps({"resultCount": 0, "results": []})
+        mock_get.return_value = mock_response
+
+        result = search_apple_movies("The Thing")
+        assert mock_get.call_count == 1
+        assert result["debug"]["search_strategies"] == ["The Thing"]
+
+        mock_get.reset_mock()
+        result = search_apple_movies("The Thing (1982)")
+        assert mock_get.call_count == 2
+        assert result["debug"]["search_strategies"] == ["The Thing (1982)", "The Thing"]
+
+    @patch("src.services.movie_search.http_session.get")
+    def test_search_apple_movies_stops_at_first_matching_variation(self, mock_get):
+        """Test that with little limiter headroom the fallback variation is only searched after a miss."""
+
+        def fake_get(url, params, timeout):
+            response = MagicMock()
+            response.ok = True
+            response.content = orjson.dumps({"results": [{"trackName": params["term"], "trackPrice": 4.99}]})
+            return response
+
+        mock_get.side_effect = fake_get
+        limiter = RateLimiter(max_calls=2, period=60)
+
+        with patch.object(movie_search, "itunes_rate_limiter", limiter):
+            result = search_apple_movies("The Thing (1982)")
+
+        assert result["movies"][0]["title"] == "The Thing (1982)"
+        assert mock_get.call_count == 1
+        api_calls = result["debug"]["api_calls"]
+        assert [call["search_term"] for call in api_calls] == ["The Thing (1982)", "The Thing"]
+        assert api_calls[1]["error"].startswith("Skipped")
+        # Only one of the two limiter slots was spent
+        assert limiter.acquire(max_wait=0) is True
+        assert limiter.acquire(max_wait=0) is False
+
+    @patch("src.services.movie_search.http_session.get")
+    def test_search_apple_movies_sends_variations_together_with_headroom(self, mock_get):
+        """Test that with limiter headroom to spare the variations are searched concurrently."""
+        # Each call waits for the other, so this only completes if both are in flight at once
+        both_sent = threading.Barrier(2, timeout=2)
+
+        def fake_get(url, params, timeout):
+            both_sent.wait()
+            response = MagicMock()
+            response.ok = True
+            results = [{"trackName": params["term"], "trackPrice": 4.99}] if params["term"] == "The Thing" else []
+            response.content = orjson.dumps({"results": results})
+            return response
+
+        mock_get.side_effect = fake_get
+
+        result = search_apple_movies("The Thing (1982)")
+
+        assert result["movies"][0]["title"] == "The Thing"
+        assert [call["search_term"] for call in result["debug"]["api_calls"]] == ["The Thing (1982)", "The Thing"]
+
+    @patch("src.services.movie_search.http_session.get")
+    def test_search_apple_movies_prefers_earlier_variation(self, mock_get):
+        """Test that concurrently searched variations are still chosen in order of preference."""
+
+        def fake_get(url, params, timeout):
+            response = MagicMock()
+            response.ok = True
+            response.content = orjson.dumps({"results": [{"trackName": params["term"], "trackPrice": 4.99}]})
+            return response
+
+        mock_get.side_effect = fake_get
+
+        result = search_apple_movies("The Thing (1982)")
+
+        assert result["movies"][0]["title"] == "The Thing (1982)"
+        api_calls = result["debug"]["api_calls"]
+        assert [call["search_term"] for call in api_calls] == ["The Thing (1982)", "The Thing"]
+        assert api_calls[1]["error"].startswith("Skipped")
+
+    @patch("src.services.movie_search.http_session.get")
+    def test_search_apple_movies_client_rate_limited(self, mock_get):
+        """Test that searches are reported as rate limited once the client budget is spent."""
+        limiter = RateLimiter(max_calls=1, period=60)
+        limiter.acquire(max_wait=0)
+
+        with patch.object(movie_search, "itunes_rate_limiter", limiter):
+            result = search_apple_movies("Heat")
+
+        mock_get.assert_not_called()
+        assert result["rate_limited"] is True
+        assert result["movies"] == []
+
+    @patch("src.services.movie_search.search_apple_movies")
+    def test_iter_apple_movie_searches_preserves_order(self, mock_search):
+        """Test that pipelined searches yield each row with its results in input order."""
+        mock_search.side_effect = lambda query: {"movies": [{"title": query}], "total": 1}
+        rows = [(i, title) for i, title in enumerate(["Alien", "Heat", "Up"] * 10)]
+
+        results = list(iter_apple_movie_searches(iter(rows), lambda row: row[1]))
+
+        assert [row for row, _ in results] == rows
+        assert all(result["movies"][0]["title"] == row[1] for row, result in results)
+        assert list(iter_apple_movie_searches([], lambda row: row)) == []
+
+    @patch("src.services.movie_search.http_session.get")
     def test_get_movie_by_track_id_success(self, mock_get):
         """Test getting movie by track ID."""
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "resultCount": 1,
-            "results": [{"trackId": 123456, "trackName": "Specific Movie", "trackPrice": 9.99}],
-        }
+        mock_response.content = orjson.dumps(
+            {
+                "resultCount": 1,
+                "results": [{"trackId": 123456, "trackName": "Specific Movie", "trackPrice": 9.99}],
+            }
+        )
         mock_get.return_value = mock_response
 
         result = get_movie_by_track_id("123456")
@@ -154,12 +449,40 @@ class TestMovieSearchService:
         assert result["movie"]["title"] == "Specific Movie"
         assert result["movie"]["price"] == 9.99
 
-    @patch("requests.get")
+    @patch("src.services.movie_search.http_session.get")
+    def test_get_movie_by_track_id_cache_hands_out_copies(self, mock_get):
+        """Test that changing a returned lookup doesn't change what later lookups get from the cache."""
+        mock_response = MagicMock()
+        mock_response.ok = True
+        mock_response.content = orjson.dumps({"results": [{"trackId": 1, "trackName": "Alien", "trackPrice": 4.99}]})
+        mock_get.return_value = mock_response
+
+        get_movie_by_track_id("1")["movie"]["price"] = 0
+
+        assert get_movie_by_track_id("1")["movie"]["price"] == 4.99
+        assert mock_get.call_count == 1
+
+    @patch("src.services.movie_search.http_session.get")
+    def test_get_movie_by_track_id_uses_result_with_different_id(self, mock_get):
+        """Test that a single lookup resolving to a collection or another track ID still finds the movie."""
+        mock_response = MagicMock()
+        mock_response.ok = True
+        mock_response.content = orjson.dumps(
+            {"results": [{"collectionId": 555, "trackId": 777, "trackName": "Alien", "trackPrice": 4.99}]}
+        )
+        mock_get.return_value = mock_response
+
+        result = get_movie_by_track_id("123")
+
+        assert result["error"] is None
+        assert result["movie"]["title"] == "Alien"
+
+    @patch("src.services.movie_search.http_session.get")
     def test_get_movie_by_track_id_not_found(self, mock_get):
         """Test getting movie by track ID when not found."""
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"resultCount": 0, "results": []}
+        mock_response.content = orjson.dumps({"resultCount": 0, "results": []})
         mock_get.return_value = mock_response
 
         result = get_movie_by_track_id("999999")
@@ -167,6 +490,32 @@ class TestMovieSearchService:
         assert "error" in result
         assert result["error"] == "Movie not found"
 
+    @patch("src.services.movie_search.http_session.get")
+    def test_get_movies_by_track_ids_batches_lookups(self, mock_get):
+        """Test that many track IDs are looked up in batches and mapped back by ID."""
+        mock_response = MagicMock()
+        mock_response.ok = True
+        mock_response.content = orjson.dumps(
+            {
+                "resultCount": 2,
+                "results": [
+                    {"trackId": 3, "trackName": "Up", "trackPrice": 3.99},
+                    {"trackId": 1, "trackName": "Alien", "trackPrice": 4.99},
+                ],
+            }
+        )
+        mock_get.return_value = mock_response
+
+        with patch.object(movie_search, "ITUNES_LOOKUP_BATCH_SIZE", 2):
+            results = get_movies_by_track_ids(["1", "2", 3, "1"])
+
+        assert mock_get.call_count == 2
+        assert mock_get.call_args_list[0].kwargs["params"]["id"] == "1,2"
+        assert mock_get.call_args_list[1].kwargs["params"]["id"] == "3"
+        assert results["1"]["movie"]["title"] == "Alien"
+        assert results["2"] == {"error": "Movie not found"}
+        assert results["3"]["movie"]["title"] == "Up"
+
     def test_get_apple_pricing(self):
         """Test Apple pricing extraction."""
         item = {
@@ -185,6 +534,21 @@ class TestMovieSearchService:
         assert result["source"] == "apple_hd_purchase"
         assert result["currency"] == "GBP"
 
+    def test_get_price_priority(self):
+        """Test that price sources rank HD purchase > purchase > collection > rental > estimated."""
+        sources = ["estimated", "apple_rental", "apple_collection", "apple_purchase", "apple_hd_purchase"]
+
+        assert sorted(sources, key=get_price_priority) == sources[::-1]
+        assert get_price_priority("manual_entry") == get_price_priority("estimated")
+
+    def test_get_apple_pricing_skips_missing_prices(self):
+        """Test that zero or missing prices fall through to the next price field."""
+        item = {"trackHdPrice": 0, "trackPrice": None, "collectionPrice": 19.99, "currency": "USD"}
+
+        result = get_apple_pricing(item)
+
+        assert result == {"price": 19.99, "source": "apple_collection", "currency": "USD"}
+
     def test_generate_estimated_movie_price(self):
         """Test movie price estimation."""
         # Recent movie
@@ -205,6 +569,7 @@ class TestMovieSearchService:
         assert extract_year_from_release_date("2023-01-01T00:00:00Z") == 2023
         assert extract_year_from_release_date("2023") == 2023
         assert extract_year_from_release_date("invalid") is None
+        assert extract_year_from_release_date("Released 15 July 2010") == 2010
 
     def test_get_mock_movie_results(self):
         """Test mock movie results."""
@@ -225,18 +590,20 @@ class TestMovieSearchService:
         """Test TMDB movie search."""
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "results": [
-                {
-                    "title": "TMDB Movie",
-                    "release_date": "2023-01-01",
-                    "id": 12345,
-                    "poster_path": "/poster.jpg",
-                    "overview": "A test movie",
-                }
-            ],
-            "total_results": 1,
-        }
+        mock_response.content = orjson.dumps(
+            {
+                "results": [
+                    {
+                        "title": "TMDB Movie",
+                        "release_date": "2023-01-01",
+                        "id": 12345,
+                        "poster_path": "/poster.jpg",
+                        "overview": "A test movie",
+                    }
+                ],
+                "total_results": 1,
+            }
+        )
         mock_get.return_value = mock_response
 
         with patch("os.getenv", return_value="test_api_key"):
@@ -244,3 +611,85 @@ class TestMovieSearchService:
 
             assert "movies" in result
             assert result["total"] == 0  # For now, returns empty results
+
+
+class TestTTLCache:
+    """Test the in-process response cache."""
+
+    def test_get_and_set(self):
+        """Test storing and reading back values."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is dropped when full."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert len(cache) == 2
+
+    def test_expired_entries_are_dropped(self):
+        """Test that entries are not returned once their TTL has passed."""
+        cache = TTLCache(maxsize=2, ttl=0)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestRateLimiter:
+    """Test the client-side API rate limiter."""
+
+    def test_allows_calls_up_to_limit(self):
+        """Test that calls beyond the window budget are refused without waiting."""
+        limiter = RateLimiter(max_calls=2, period=60)
+
+        assert limiter.acquire(max_wait=0) is True
+        assert limiter.acquire(max_wait=0) is True
+        assert limiter.acquire(max_wait=0) is False
+
+    def test_waits_for_slot_within_max_wait(self):
+        """Test that a caller sleeps until the oldest call leaves the window."""
+        limiter = RateLimiter(max_calls=1, period=0.05)
+        limiter.acquire(max_wait=0)
+
+        assert limiter.acquire(max_wait=1) is True
+
+    def test_waiting_caller_does_not_block_others(self):
+        """Test that a caller whose max_wait is too short is refused while another caller is waiting."""
+        limiter = RateLimiter(max_calls=1, period=0.5)
+        limiter.acquire(max_wait=0)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            waiting = executor.submit(limiter.acquire, 1)
+            time.sleep(0.05)
+
+            started = time.monotonic()
+            assert limiter.acquire(max_wait=0) is False
+            assert time.monotonic() - started < 0.1
+
+            assert waiting.result() is True
+
+    def test_available(self):
+        """Test that available counts the calls that can be made without waiting."""
+        limiter = RateLimiter(max_calls=2, period=60)
+        assert limiter.available() == 2
+
+        limiter.acquire(max_wait=0)
+        assert limiter.available() == 1
+
+    def test_reset(self):
+        """Test that reset frees the whole budget."""
+        limiter = RateLimiter(max_calls=1, period=60)
+        limiter.acquire(max_wait=0)
+        limiter.reset()
+
+        assert limiter.acquire(max_wait=0) is True
@@ -24,7 +24,7 @@ class TestBookSearchServiceSimple:
         assert "source" in result
 
     @patch("src.services.book_search.get_mock_results")
-    @patch("requests.get")
+    @patch("src.services.book_search.http_session.get")
     def test_search_google_books_fallback_to_mock(self, mock_requests, mock_get_mock):
         """Test that Google Books search falls back to mock on error."""
         from src.services.book_search import search_google_books
@@ -102,7 +102,7 @@ class TestMovieSearchServiceSimple:
         assert "price" in result
 
     @patch("src.services.movie_search.get_mock_movie_results")
-    @patch("requests.get")
+    @patch("src.services.movie_search.http_session.get")
     def test_search_apple_movies_fallback(self, mock_requests, mock_get_mock):
         """Test Apple movie search fallback to mock."""
         from src.services.movie_search import search_apple_movies
@@ -122,7 +122,7 @@ class TestMovieSearchServiceSimple:
         assert result["total"] == 0
 
     @patch("src.services.movie_search.get_mock_movie_results")
-    @patch("requests.get")
+    @patch("src.services.movie_search.http_session.get")
     def test_get_movie_by_track_id_fallback(self, mock_requests, mock_get_mock):
         """Test get movie by track ID fallback."""
         from src.services.movie_search import get_movie_by_track_id
@@ -4,34 +4,22 @@ Tests the new UI components: Modal, FilterControls, UIComponents, and FormHandle
 """
 
 import json
-import os
 import subprocess
-import tempfile
 
 import pytest
 
 
 @pytest.fixture
 def js_test_runner():
-    """Create a temporary JS file to run tests."""
+    """Run JS test code with Node.js, passing it on stdin."""
 
     def runner(js_code):
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".js", delete=False) as f:
-            # Write test code
-            f.write(js_code)
-            f.flush()
-
-            try:
-                # Run with Node.js
-                result = subprocess.run(["node", f.name], capture_output=True, text=True, timeout=5)
-
-                if result.returncode != 0:
-                    raise Exception(f"JavaScript error: {result.stderr}")
-
-                return result.stdout.strip()
-            finally:
-                # Clean up
-                os.unlink(f.name)
+        result = subprocess.run(["node", "-"], input=js_code, capture_output=True, text=True, timeout=5)
+
+        if result.returncode != 0:
+            raise Exception(f"JavaScript error: {result.stderr}")
+
+        return result.stdout.strip()
 
     return runner
 
@@ -5,6 +5,7 @@ These tests actually call the real functions with mocked HTTP requests.
 
 from unittest.mock import MagicMock, patch
 
+import orjson
 import pytest
 import requests
 
@@ -12,7 +13,7 @@ import requests
 class TestBookSearchService:
     """Test book search service functions that exist."""
 
-    @patch("requests.get")
+    @patch("src.services.book_search.http_session.get")
     def test_search_google_books_success(self, mock_get):
         """Test successful Google Books search."""
         # Import here to avoid import errors during collection
@@ -21,26 +22,28 @@ class TestBookSearchService:
         # Mock successful response
         mock_response = MagicMock()
         mock_response.ok = True
-        mock_response.json.return_value = {
-            "items": [
-                {
-                    "id": "book123",
-                    "volumeInfo": {
-                        "title": "Test Book",
-                        "authors": ["Test Author"],
-                        "publisher": "Test Publisher",
-                        "publishedDate": "2023-01-01",
-                        "description": "Test description",
-                        "industryIdentifiers": [{"type": "ISBN_13", "identifier": "1234567890123"}],
-                        "pageCount": 300,
-                        "categories": ["Fiction"],
-                        "imageLinks": {"thumbnail": "https://example.com/thumb.jpg"},
-                    },
-                    "saleInfo": {"listPrice": {"amount": 19.99, "currencyCode": "GBP"}},
-                }
-            ],
-            "totalItems": 1,
-        }
+        mock_response.content = orjson.dumps(
+            {
+                "items": [
+                    {
+                        "id": "book123",
+                        "volumeInfo": {
+                            "title": "Test Book",
+                            "authors": ["Test Author"],
+                            "publisher": "Test Publisher",
+                            "publishedDate": "2023-01-01",
+                            "description": "Test description",
+                            "industryIdentifiers": [{"type": "ISBN_13", "identifier": "1234567890123"}],
+                            "pageCount": 300,
+                            "categories": ["Fiction"],
+                            "imageLinks": {"thumbnail": "https://example.com/thumb.jpg"},
+                        },
+                        "saleInfo": {"listPrice": {"amount": 19.99, "currencyCode": "GBP"}},
+                    }
+                ],
+                "totalItems": 1,
+            }
+        )
         mock_get.return_value = mock_response
 
         result = search_google_books("test query")
@@ -51,7 +54,7 @@ class TestBookSearchService:
         assert len(result["books"]) > 0
         mock_get.assert_called_once()
 
-    @patch("requests.get")
+    @patch("src.services.book_search.http_session.get")
     def test_search_google_books_api_error(self, mock_get):
         """Test Google Books search with API error."""
         from src.services.book_search import search_google_books
@@ -66,7 +69,7 @@ class TestBookSearchService:
         assert "total" in result
         assert "source" in result
 
-    @patch("requests.get")
+    @patch("src.services.book_search.http_session.get")
     def test_search_google_books_no_results(self, mock_get):
         """Test Google Books search with no results."""
         from src.services.book_search import search_google_books
@@ -74,7 +77,7 @@ class TestBookSearchService:
         # Mock empty response
         mock_response = MagicMock()
         mock_response.ok = True
-        mock_response.json.return_value = {"totalItems": 0}
+        mock_response.content = orjson.dumps({"totalItems": 0})
         mock_get.return_value = mock_response
 
         result = search_google_books("nonexistent book")
@@ -101,7 +104,7 @@ class TestBookSearchService:
         assert "author" in book
         assert "price" in book
 
-    @patch("requests.get")
+    @patch("src.services.book_search.http_session.get")
     def test_search_google_books_bad_response(self, mock_get):
         """Test Google Books search with bad HTTP response."""
         from src.services.book_search import search_google_books
@@ -120,30 +123,32 @@ class TestBookSearchService:
 class TestMovieSearchService:
     """Test movie search service functions."""
 
-    @patch("requests.get")
+    @patch("src.services.movie_search.http_session.get")
     def test_search_apple_movies_success(self, mock_get):
         """Test successful Apple movie search."""
         from src.services.movie_search import search_apple_movies
 
         mock_response = MagicMock()
         mock_response.ok = True
-        mock_response.json.return_value = {
-            "resultCount": 1,
-            "results": [
-                {
-                    "trackId": 123456,
-                    "trackName": "Test Movie",
-                    "artistName": "Test Director",
-                    "releaseDate": "2023-01-01T00:00:00Z",
-                    "trackPrice": 14.99,
-                    "currency": "GBP",
-                    "artworkUrl100": "https://example.com/movie.jpg",
-                    "longDescription": "Test description",
-                    "trackTimeMillis": 7200000,
-                    "primaryGenreName": "Action",
-                }
-            ],
-        }
+        mock_response.content = orjson.dumps(
+            {
+                "resultCount": 1,
+                "results": [
+                    {
+                        "trackId": 123456,
+                        "trackName": "Test Movie",
+                        "artistName": "Test Director",
+                        "releaseDate": "2023-01-01T00:00:00Z",
+                        "trackPrice": 14.99,
+                        "currency": "GBP",
+                        "artworkUrl100": "https://example.com/movie.jpg",
+                        "longDescription": "Test description",
+                        "trackTimeMillis": 7200000,
+                        "primaryGenreName": "Action",
+                    }
+                ],
+            }
+        )
         mock_get.return_value = mock_response
 
         result = search_apple_movies("test movie")
@@ -156,7 +161,7 @@ class TestMovieSearchService:
         assert "price" in movie
         assert "trackId" in movie
 
-    @patch("requests.get")
+    @patch("src.services.movie_search.http_session.get")
     def test_search_apple_movies_api_error(self, mock_get):
         """Test Apple movie search with API error."""
         from src.services.movie_search import search_apple_movies
@@ -169,25 +174,27 @@ class TestMovieSearchService:
         assert "movies" in result
         assert "total" in result
 
-    @patch("requests.get")
+    @patch("src.services.movie_search.http_session.get")
     def test_get_movie_by_track_id_success(self, mock_get):
         """Test getting movie by track ID."""
         from src.services.movie_search import get_movie_by_track_id
 
         mock_response = MagicMock()
         mock_response.ok = True
-        mock_response.json.return_value = {
-            "resultCount": 1,
-            "results": [
-                {
-                    "trackId": 123456,
-                    "trackName": "Specific Movie",
-                    "trackPrice": 9.99,
-                    "artistName": "Director",
-                    "releaseDate": "2023-01-01T00:00:00Z",
-                }
-            ],
-        }
+        mock_response.content = orjson.dumps(
+            {
+                "resultCount": 1,
+                "results": [
+                    {
+                        "trackId": 123456,
+                        "trackName": "Specific Movie",
+                        "trackPrice": 9.99,
+                        "artistName": "Director",
+                        "releaseDate": "2023-01-01T00:00:00Z",
+                    }
+                ],
+            }
+        )
         mock_get.return_value = mock_response
 
         result = get_movie_by_track_id("123456")
@@ -196,14 +203,14 @@ class TestMovieSearchService:
         assert result["movie"]["title"] == "Specific Movie"
         assert result["movie"]["price"] == 9.99
 
-    @patch("requests.get")
+    @patch("src.services.movie_search.http_session.get")
     def test_get_movie_by_track_id_not_found(self, mock_get):
         """Test getting movie by track ID when not found."""
         from src.services.movie_search import get_movie_by_track_id
 
         mock_response = MagicMock()
         mock_response.ok = True
-        mock_response.json.return_value = {"resultCount": 0, "results": []}
+        mock_response.content = orjson.dumps({"resultCount": 0, "results": []})
         mock_get.return_value = mock_response
 
         result = get_movie_by_track_id("999999")
@@ -279,18 +286,20 @@ class TestMovieSearchService:
 
         mock_response = MagicMock()
         mock_response.ok = True
-        mock_response.json.return_value = {
-            "results": [
-                {
-                    "title": "TMDB Movie",
-                    "release_date": "2023-01-01",
-                    "id": 12345,
-                    "poster_path": "/poster.jpg",
-                    "overview": "A test movie",
-                }
-            ],
-            "total_results": 1,
-        }
+        mock_response.content = orjson.dumps(
+            {
+                "results": [
+                    {
+                        "title": "TMDB Movie",
+                        "release_date": "2023-01-01",
+                        "id": 12345,
+                        "poster_path": "/poster.jpg",
+                        "overview": "A test movie",
+                    }
+                ],
+                "total_results": 1,
+            }
+        )
         mock_get.return_value = mock_response
 
         with patch("os.getenv", return_value="test_api_key"):